@@ -0,0 +1,82 @@
+import json
+import timeit
+from datetime import date, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from src.dto.dashboard.metric_data import MetricData
+from src.endpoints.models.dashboard.responses import (
+    DashboardAccuracyResponse,
+    DashboardJSONResponse,
+    DashboardResponse,
+)
+from src.enums import MetricAccuracy, MetricType
+from src.repositories.metric_plans import DISTINCT_USER_METRICS, METRIC_PLANS, REVENUE
+from src.repositories.metric_query_planner import MetricInput, distinct_relative_error
+
+ITERATIONS = 2_000
+ROWS_PER_SERIES = 30
+
+
+def _sample_column(name: str, rows: int) -> tuple:
+    if name == "bucket":
+        return tuple(date(2024, 1, 1) + timedelta(days=day) for day in range(rows))
+    if name == "currency":
+        return tuple(("USD", "EUR", "GBP")[row % 3] for row in range(rows))
+    if name in ("event_type", "dimension_key", "dimension_value"):
+        return tuple(f"{name}_{row}" for row in range(rows))
+    return tuple(row + 42 for row in range(rows))
+
+
+def _sample_input(metric_input: MetricInput) -> list[tuple]:
+    rows = ROWS_PER_SERIES if metric_input.keys else 1
+    columns = [_sample_column(name, rows) for name in metric_input.keys]
+    for aggregate in metric_input.aggregates:
+        if aggregate == REVENUE:
+            columns.append(tuple(Decimal(f"{1000 + row}.25") for row in range(rows)))
+        else:
+            columns.append(_sample_column(aggregate.argument, rows))
+    return columns
+
+
+def build_dashboard() -> dict[MetricType, MetricData]:
+    return {
+        metric_type: plan.build(*(_sample_input(metric_input) for metric_input in plan.inputs))
+        for metric_type, plan in METRIC_PLANS.items()
+    }
+
+
+def build_accuracy() -> DashboardAccuracyResponse:
+    return DashboardAccuracyResponse(
+        mode=MetricAccuracy.SKETCH,
+        relative_errors={
+            metric_type: distinct_relative_error(MetricAccuracy.SKETCH, 1, None)
+            for metric_type in DISTINCT_USER_METRICS
+        },
+    )
+
+
+def main() -> None:
+    metrics = build_dashboard()
+    accuracy = build_accuracy()
+    accuracy_report = accuracy.model_dump()
+    cold_dashboards = iter([build_dashboard() for _ in range(ITERATIONS + 1)])
+    encoders = {
+        "jsonable_encoder": lambda: json.dumps(
+            jsonable_encoder(DashboardResponse(metrics=metrics, accuracy=accuracy))
+        ).encode(),
+        "pydantic": lambda: DashboardResponse(metrics=metrics, accuracy=accuracy).model_dump_json().encode(),
+        "orjson (cold)": lambda: DashboardJSONResponse(
+            {"metrics": next(cold_dashboards), "accuracy": accuracy_report}
+        ).body,
+        "orjson (cached)": lambda: DashboardJSONResponse({"metrics": metrics, "accuracy": accuracy_report}).body,
+    }
+    print(f"{'encoder':<18} {'us/response':>12} {'bytes':>7}")
+    for name, encode in encoders.items():
+        seconds = timeit.timeit(encode, number=ITERATIONS)
+        print(f"{name:<18} {seconds / ITERATIONS * 1e6:>12.1f} {len(encode()):>7}")
+
+
+if __name__ == "__main__":
+    main()
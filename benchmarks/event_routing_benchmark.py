@@ -0,0 +1,49 @@
+import timeit
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+from src.endpoints.models.events import (
+    FilterAppliedEvent,
+    PageViewEvent,
+    TransactionEvent,
+    UserLoginEvent,
+)
+from src.enums import EventSerializationFormat, MessageKeyField
+from src.services.event_registry import EVENT_ROUTES, EventRegistry
+from src.services.event_serializers import create_event_serializer
+
+ITERATIONS = 100_000
+
+SAMPLE_EVENTS: list[BaseModel] = [
+    UserLoginEvent(user_id="user_123", timestamp=datetime.now(timezone.utc)),
+    TransactionEvent(
+        user_id="user_123",
+        transaction_id="txn_456",
+        amount=Decimal("129.99"),
+        currency="USD",
+        timestamp=datetime.now(timezone.utc),
+    ),
+    PageViewEvent(user_id="user_123", page="/catalog", timestamp=datetime.now(timezone.utc)),
+    FilterAppliedEvent(
+        user_id="user_123",
+        filter_name="brand",
+        filter_value="acme",
+        page="/catalog",
+        timestamp=datetime.now(timezone.utc),
+    ),
+]
+
+
+def main() -> None:
+    print(f"{'format':<10} {'event_type':<20} {'ns/event':>10}")
+    for serialization_format in EventSerializationFormat:
+        registry = EventRegistry(EVENT_ROUTES, create_event_serializer(serialization_format), MessageKeyField.USER_ID)
+        for event in SAMPLE_EVENTS:
+            seconds = timeit.timeit(lambda r=registry, e=event: r.encode(e), number=ITERATIONS)
+            print(f"{serialization_format.value:<10} {event.event_type.value:<20} {seconds / ITERATIONS * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import timeit
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from src.enums import EventSerializationFormat, EventType, KafkaTopic
+from src.services.event_serializers import create_event_serializer
+
+ITERATIONS = 100_000
+
+SAMPLE_EVENTS: list[tuple[KafkaTopic, dict[str, object]]] = [
+    (
+        KafkaTopic.USER_EVENTS,
+        {"user_id": "user_123", "timestamp": datetime.now(timezone.utc), "event_type": EventType.USER_LOGIN},
+    ),
+    (
+        KafkaTopic.TRANSACTION_EVENTS,
+        {
+            "user_id": "user_123",
+            "timestamp": datetime.now(timezone.utc),
+            "transaction_id": "txn_456",
+            "amount": Decimal("129.99"),
+            "currency": "USD",
+            "event_type": EventType.TRANSACTION,
+        },
+    ),
+    (
+        KafkaTopic.INTERACTION_EVENTS,
+        {
+            "user_id": "user_123",
+            "timestamp": datetime.now(timezone.utc),
+            "filter_name": "brand",
+            "filter_value": "acme",
+            "page": "/catalog",
+            "event_type": EventType.FILTER_APPLIED,
+        },
+    ),
+]
+
+
+def main() -> None:
+    print(f"{'format':<10} {'topic':<20} {'ns/event':>10} {'bytes':>7}")
+    for serialization_format in EventSerializationFormat:
+        serializer = create_event_serializer(serialization_format)
+        for topic, event in SAMPLE_EVENTS:
+            seconds = timeit.timeit(lambda s=serializer, t=topic, e=event: s.serialize(t, e), number=ITERATIONS)
+            size = len(serializer.serialize(topic, event))
+            print(f"{serialization_format.value:<10} {topic.value:<20} {seconds / ITERATIONS * 1e9:>10.0f} {size:>7}")
+
+
+if __name__ == "__main__":
+    main()
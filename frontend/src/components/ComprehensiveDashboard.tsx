@@ -31,20 +31,20 @@ const ComprehensiveDashboard: React.FC = () => {
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    const fetchMetrics = async () => {
-      try {
-        setLoading(true);
-        const response = await dashboardApi.getAllMetrics();
-        setMetrics(response.metrics);
-      } catch (err) {
-        setError('Failed to fetch dashboard metrics');
-        console.error('Error fetching metrics:', err);
-      } finally {
+    const unsubscribe = dashboardApi.subscribeToMetrics(
+      (update) => {
+        setMetrics((current: any) => (update.kind === 'snapshot' ? update.metrics : { ...current, ...update.metrics }));
+        setError(null);
+        setLoading(false);
+      },
+      (err) => {
+        setError('Lost connection to dashboard updates, reconnecting...');
+        console.error('Error streaming metrics:', err);
         setLoading(false);
       }
-    };
+    );
 
-    fetchMetrics();
+    return unsubscribe;
   }, []);
 
   if (loading) {
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { DashboardResponse } from '../types/metrics';
+import { DashboardResponse, DashboardStreamUpdate, DashboardTimeRange, MetricType } from '../types/metrics';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
 
@@ -11,8 +11,33 @@ const apiClient = axios.create({
 });
 
 export const dashboardApi = {
-  getAllMetrics: async (): Promise<DashboardResponse> => {
-    const response = await apiClient.get('/dashboard');
+  getAllMetrics: async (timeRange?: DashboardTimeRange): Promise<DashboardResponse> => {
+    const response = await apiClient.get('/dashboard', { params: timeRange });
     return response.data;
+  },
+
+  getMetrics: async (metrics: MetricType[], timeRange?: DashboardTimeRange): Promise<DashboardResponse> => {
+    const response = await apiClient.post('/dashboard', { metrics, ...timeRange });
+    return response.data;
+  },
+
+  subscribeToMetrics: (
+    onUpdate: (update: DashboardStreamUpdate) => void,
+    onError?: (event: Event) => void,
+    metrics?: MetricType[]
+  ): (() => void) => {
+    const params = new URLSearchParams();
+    metrics?.forEach((metric) => params.append('metrics', metric));
+    const query = params.toString();
+    const source = new EventSource(`${API_BASE_URL}/dashboard/stream${query ? `?${query}` : ''}`);
+    const handle = (kind: DashboardStreamUpdate['kind']) => (event: MessageEvent) => {
+      onUpdate({ kind, metrics: JSON.parse(event.data).metrics });
+    };
+    source.addEventListener('snapshot', handle('snapshot'));
+    source.addEventListener('diff', handle('diff'));
+    if (onError) {
+      source.onerror = onError;
+    }
+    return () => source.close();
   }
 };
\ No newline at end of file
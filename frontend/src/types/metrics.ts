@@ -31,6 +31,26 @@ export interface MetricData {
   [key: string]: any;
 }
 
+export type MetricGranularity = 'hour' | 'day' | 'week';
+
+export type MetricAccuracy = 'sketch' | 'exact' | 'combined' | 'hll' | 'sampled';
+
+export interface DashboardTimeRange {
+  from?: string;
+  to?: string;
+  granularity?: MetricGranularity;
+  since?: string;
+  accuracy?: MetricAccuracy;
+}
+
 export interface DashboardResponse {
   metrics: Record<string, MetricData[]>;
+  time_range: { start: string; end: string; granularity: MetricGranularity } | null;
+  cursor: string | null;
+  accuracy: { mode: MetricAccuracy; relative_errors: Record<string, number | null> };
+}
+
+export interface DashboardStreamUpdate {
+  kind: 'snapshot' | 'diff';
+  metrics: Record<string, MetricData[]>;
 }
\ No newline at end of file
@@ -1,6 +1,13 @@
 #!/bin/bash
 
 CLICKHOUSE_URL="http://clickhouse:8123"
+EVENT_SERIALIZATION_FORMAT="${EVENT_SERIALIZATION_FORMAT:-orjson}"
+
+case "$EVENT_SERIALIZATION_FORMAT" in
+    msgpack) KAFKA_FORMAT="MsgPack" ;;
+    json|orjson) KAFKA_FORMAT="JSONEachRow" ;;
+    *) echo "Unknown EVENT_SERIALIZATION_FORMAT: $EVENT_SERIALIZATION_FORMAT"; exit 1 ;;
+esac
 
 echo "Waiting for ClickHouse to be ready..."
 until curl -s -f "$CLICKHOUSE_URL/ping" >/dev/null 2>&1; do
@@ -13,7 +20,7 @@ echo "Creating database and tables..."
 
 curl -X POST "$CLICKHOUSE_URL" -d "CREATE DATABASE IF NOT EXISTS analytics"
 
-echo "Creating Kafka Engine tables..."
+echo "Creating Kafka Engine tables with format $KAFKA_FORMAT..."
 
 curl -X POST "$CLICKHOUSE_URL"  -d "
 CREATE TABLE IF NOT EXISTS analytics.user_events (
@@ -25,7 +32,7 @@ SETTINGS
     kafka_broker_list = 'kafka:9092',
     kafka_topic_list = 'user_events',
     kafka_group_name = 'clickhouse_user_consumer',
-    kafka_format = 'JSONEachRow',
+    kafka_format = '$KAFKA_FORMAT',
     kafka_num_consumers = 1"
 
 curl -X POST "$CLICKHOUSE_URL"  -d "
@@ -41,7 +48,7 @@ SETTINGS
     kafka_broker_list = 'kafka:9092',
     kafka_topic_list = 'transaction_events',
     kafka_group_name = 'clickhouse_transaction_consumer',
-    kafka_format = 'JSONEachRow',
+    kafka_format = '$KAFKA_FORMAT',
     kafka_num_consumers = 1"
 
 curl -X POST "$CLICKHOUSE_URL"  -d "
@@ -61,7 +68,7 @@ SETTINGS
     kafka_broker_list = 'kafka:9092',
     kafka_topic_list = 'interaction_events',
     kafka_group_name = 'clickhouse_interaction_consumer',
-    kafka_format = 'JSONEachRow',
+    kafka_format = '$KAFKA_FORMAT',
     kafka_num_consumers = 1"
 
 echo "Creating MergeTree storage tables..."
@@ -100,18 +107,105 @@ CREATE TABLE IF NOT EXISTS analytics.interaction_events_storage (
 ) ENGINE = MergeTree()
 ORDER BY (timestamp, user_id, event_type)"
 
-echo "Creating materialized views from Kafka to Storage tables..."
-
-curl -X POST "$CLICKHOUSE_URL"  -d "
-CREATE MATERIALIZED VIEW IF NOT EXISTS analytics.user_events_consumer TO analytics.user_events_storage AS
-SELECT event_type, user_id, parseDateTimeBestEffort(timestamp) as timestamp FROM analytics.user_events"
-
-curl -X POST "$CLICKHOUSE_URL"  -d "
-CREATE MATERIALIZED VIEW IF NOT EXISTS analytics.transaction_events_consumer TO analytics.transaction_events_storage AS
-SELECT event_type, user_id, transaction_id, amount, currency, parseDateTimeBestEffort(timestamp) as timestamp FROM analytics.transaction_events"
-
-curl -X POST "$CLICKHOUSE_URL"  -d "
-CREATE MATERIALIZED VIEW IF NOT EXISTS analytics.interaction_events_consumer TO analytics.interaction_events_storage AS
-SELECT event_type, user_id, element_name, page, query, form_name, item_id, filter_name, filter_value, parseDateTimeBestEffort(timestamp) as timestamp FROM analytics.interaction_events"
+echo "Creating rollup tables..."
+
+rollup_select() {
+    printf '%s' "$1" | sed "s|__SOURCE_FILTER__|$2|"
+}
+
+create_rollup() {
+    table="$1"
+    create_table_sql="$2"
+    select_sql="$3"
+
+    exists=$(curl -s "$CLICKHOUSE_URL" -d "EXISTS TABLE analytics.$table")
+    curl -X POST "$CLICKHOUSE_URL" -d "$create_table_sql"
+
+    if [ "$exists" = "0" ]; then
+        cutoff=$(curl -s "$CLICKHOUSE_URL" -d "SELECT toString(now64(3))")
+        mv_filter="timestamp >= toDateTime64('$cutoff', 3)"
+        backfill_filter="timestamp < toDateTime64('$cutoff', 3)"
+        curl -X POST "$CLICKHOUSE_URL" -d "CREATE MATERIALIZED VIEW IF NOT EXISTS analytics.${table}_mv TO analytics.$table AS $(rollup_select "$select_sql" "$mv_filter")"
+        echo "Backfilling analytics.$table from raw events before $cutoff..."
+        curl -X POST "$CLICKHOUSE_URL" -d "INSERT INTO analytics.$table $(rollup_select "$select_sql" "$backfill_filter")"
+    else
+        curl -X POST "$CLICKHOUSE_URL" -d "CREATE MATERIALIZED VIEW IF NOT EXISTS analytics.${table}_mv TO analytics.$table AS $(rollup_select "$select_sql" "1")"
+    fi
+}
+
+create_rollup user_events_hourly "
+CREATE TABLE IF NOT EXISTS analytics.user_events_hourly (
+    hour DateTime,
+    event_type LowCardinality(String),
+    events SimpleAggregateFunction(sum, UInt64),
+    users AggregateFunction(uniq, String)
+) ENGINE = AggregatingMergeTree()
+ORDER BY (event_type, hour)" "
+SELECT toStartOfHour(timestamp) AS hour, event_type, count() AS events, uniqState(user_id) AS users
+FROM analytics.user_events_storage
+WHERE __SOURCE_FILTER__
+GROUP BY hour, event_type"
+
+create_rollup transaction_events_hourly "
+CREATE TABLE IF NOT EXISTS analytics.transaction_events_hourly (
+    hour DateTime,
+    currency LowCardinality(String),
+    transactions SimpleAggregateFunction(sum, UInt64),
+    revenue SimpleAggregateFunction(sum, Decimal128(2)),
+    users AggregateFunction(uniq, String)
+) ENGINE = AggregatingMergeTree()
+ORDER BY (hour, currency)" "
+SELECT toStartOfHour(timestamp) AS hour, currency, count() AS transactions, sum(amount) AS revenue, uniqState(user_id) AS users
+FROM analytics.transaction_events_storage
+WHERE __SOURCE_FILTER__
+GROUP BY hour, currency"
+
+create_rollup interaction_events_hourly "
+CREATE TABLE IF NOT EXISTS analytics.interaction_events_hourly (
+    hour DateTime,
+    event_type LowCardinality(String),
+    events SimpleAggregateFunction(sum, UInt64),
+    users AggregateFunction(uniq, String)
+) ENGINE = AggregatingMergeTree()
+ORDER BY (event_type, hour)" "
+SELECT toStartOfHour(timestamp) AS hour, event_type, count() AS events, uniqState(user_id) AS users
+FROM analytics.interaction_events_storage
+WHERE __SOURCE_FILTER__
+GROUP BY hour, event_type"
+
+create_rollup interaction_dimensions_hourly "
+CREATE TABLE IF NOT EXISTS analytics.interaction_dimensions_hourly (
+    hour DateTime,
+    event_type LowCardinality(String),
+    dimension_key String,
+    dimension_value String,
+    events SimpleAggregateFunction(sum, UInt64),
+    users AggregateFunction(uniq, String)
+) ENGINE = AggregatingMergeTree()
+ORDER BY (event_type, hour, dimension_key, dimension_value)" "
+SELECT
+    toStartOfHour(timestamp) AS hour,
+    event_type,
+    assumeNotNull(multiIf(
+        event_type = 'page_view', page,
+        event_type = 'search', query,
+        event_type = 'element_click', element_name,
+        event_type = 'filter_applied', filter_name,
+        item_id
+    )) AS dimension_key,
+    if(event_type = 'filter_applied', ifNull(filter_value, ''), '') AS dimension_value,
+    count() AS events,
+    uniqState(user_id) AS users
+FROM analytics.interaction_events_storage
+WHERE __SOURCE_FILTER__
+    AND event_type IN ('page_view', 'search', 'element_click', 'filter_applied', 'item_added_to_cart')
+    AND multiIf(
+        event_type = 'page_view', page,
+        event_type = 'search', query,
+        event_type = 'element_click', element_name,
+        event_type = 'filter_applied', filter_name,
+        item_id
+    ) IS NOT NULL
+GROUP BY hour, event_type, dimension_key, dimension_value"
 
 echo "ClickHouse setup completed!"
\ No newline at end of file
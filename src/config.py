@@ -1,22 +1,196 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+from src.enums import (
+    BufferOverflowPolicy,
+    ClickHouseIngestMode,
+    ContentEncoding,
+    EventProducerMode,
+    EventSerializationFormat,
+    KafkaPartitionerType,
+    KafkaProducerProfile,
+    MessageKeyField,
+)
+
+
+@dataclass
+class KafkaProducerSettings:
+    profile: KafkaProducerProfile
+    linger_ms: int
+    max_batch_size: int
+    compression_type: str | None
+    acks: int | str
+    enable_idempotence: bool
+    request_timeout_ms: int
+
+
+KAFKA_PRODUCER_PROFILES: dict[KafkaProducerProfile, KafkaProducerSettings] = {
+    KafkaProducerProfile.LATENCY: KafkaProducerSettings(
+        profile=KafkaProducerProfile.LATENCY,
+        linger_ms=0,
+        max_batch_size=16384,
+        compression_type=None,
+        acks=1,
+        enable_idempotence=False,
+        request_timeout_ms=40000,
+    ),
+    KafkaProducerProfile.THROUGHPUT: KafkaProducerSettings(
+        profile=KafkaProducerProfile.THROUGHPUT,
+        linger_ms=20,
+        max_batch_size=262144,
+        compression_type="lz4",
+        acks=1,
+        enable_idempotence=False,
+        request_timeout_ms=40000,
+    ),
+    KafkaProducerProfile.DURABLE: KafkaProducerSettings(
+        profile=KafkaProducerProfile.DURABLE,
+        linger_ms=5,
+        max_batch_size=65536,
+        compression_type="zstd",
+        acks="all",
+        enable_idempotence=True,
+        request_timeout_ms=60000,
+    ),
+}
+
+
+def _parse_acks(value: str) -> int | str:
+    return value if value == "all" else int(value)
+
+
+def _available_cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _load_kafka_producer_settings(profile: KafkaProducerProfile) -> KafkaProducerSettings:
+    overrides: dict[str, object] = {}
+    if linger_ms := os.getenv("KAFKA_PRODUCER_LINGER_MS"):
+        overrides["linger_ms"] = int(linger_ms)
+    if max_batch_size := os.getenv("KAFKA_PRODUCER_MAX_BATCH_SIZE"):
+        overrides["max_batch_size"] = int(max_batch_size)
+    if compression_type := os.getenv("KAFKA_PRODUCER_COMPRESSION_TYPE"):
+        overrides["compression_type"] = None if compression_type == "none" else compression_type
+    if acks := os.getenv("KAFKA_PRODUCER_ACKS"):
+        overrides["acks"] = _parse_acks(acks)
+    if enable_idempotence := os.getenv("KAFKA_PRODUCER_ENABLE_IDEMPOTENCE"):
+        overrides["enable_idempotence"] = enable_idempotence.lower() == "true"
+    if request_timeout_ms := os.getenv("KAFKA_PRODUCER_REQUEST_TIMEOUT_MS"):
+        overrides["request_timeout_ms"] = int(request_timeout_ms)
+    return replace(KAFKA_PRODUCER_PROFILES[profile], **overrides)
+
+
+@dataclass
+class ClickHouseKafkaEngineSettings:
+    num_consumers: int
+    max_block_size: int
+    flush_interval_ms: int
+    thread_per_consumer: bool
+    skip_broken_messages: int
+    dead_letter_enabled: bool
+
+
+def _load_clickhouse_kafka_engine_settings(topic_partitions: int) -> ClickHouseKafkaEngineSettings:
+    return ClickHouseKafkaEngineSettings(
+        num_consumers=int(os.getenv("CLICKHOUSE_KAFKA_NUM_CONSUMERS") or topic_partitions),
+        max_block_size=int(os.getenv("CLICKHOUSE_KAFKA_MAX_BLOCK_SIZE", "65536")),
+        flush_interval_ms=int(os.getenv("CLICKHOUSE_KAFKA_FLUSH_INTERVAL_MS", "1000")),
+        thread_per_consumer=os.getenv("CLICKHOUSE_KAFKA_THREAD_PER_CONSUMER", "true").lower() == "true",
+        skip_broken_messages=int(os.getenv("CLICKHOUSE_KAFKA_SKIP_BROKEN_MESSAGES", "100")),
+        dead_letter_enabled=os.getenv("CLICKHOUSE_KAFKA_DEAD_LETTER_ENABLED", "true").lower() == "true",
+    )
 
 
 @dataclass
 class Config:
+    api_host: str = os.getenv("API_HOST", "0.0.0.0")
+    api_port: int = int(os.getenv("API_PORT", "8000"))
+    api_workers: int = int(os.getenv("API_WORKERS", "1"))
+    api_leader_lock_path: str = os.getenv("API_LEADER_LOCK_PATH", "/tmp/analytics-api-leader.lock")
     kafka_bootstrap_servers: str = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
     kafka_brokers: list[str] = None
     kafka_topic_partitions: int = int(os.getenv("KAFKA_TOPIC_PARTITIONS", "3"))
     kafka_replication_factor: int = int(os.getenv("KAFKA_REPLICATION_FACTOR", "1"))
+    kafka_producer_profile: KafkaProducerProfile = KafkaProducerProfile(os.getenv("KAFKA_PRODUCER_PROFILE", "latency"))
+    kafka_producer_settings: KafkaProducerSettings = None
+    kafka_message_key_field: MessageKeyField = MessageKeyField(os.getenv("KAFKA_MESSAGE_KEY_FIELD", "user_id"))
+    kafka_partitioner: KafkaPartitionerType = KafkaPartitionerType(os.getenv("KAFKA_PARTITIONER", "murmur2"))
+    event_serialization_format: EventSerializationFormat = EventSerializationFormat(
+        os.getenv("EVENT_SERIALIZATION_FORMAT", "orjson")
+    )
+    event_producer_mode: EventProducerMode = EventProducerMode(os.getenv("EVENT_PRODUCER_MODE", "direct"))
+    event_buffer_capacity: int = int(os.getenv("EVENT_BUFFER_CAPACITY", "10000"))
+    event_buffer_drain_batch_size: int = int(os.getenv("EVENT_BUFFER_DRAIN_BATCH_SIZE", "500"))
+    event_buffer_drain_workers: int = int(os.getenv("EVENT_BUFFER_DRAIN_WORKERS", "2"))
+    event_buffer_overflow_policy: BufferOverflowPolicy = BufferOverflowPolicy(
+        os.getenv("EVENT_BUFFER_OVERFLOW_POLICY", "block")
+    )
+    event_buffer_block_timeout_seconds: float = float(os.getenv("EVENT_BUFFER_BLOCK_TIMEOUT_SECONDS", "1"))
     clickhouse_host: str = os.getenv("CLICKHOUSE_HOST", "localhost")
     clickhouse_port: int = int(os.getenv("CLICKHOUSE_PORT", "9000"))
     clickhouse_database: str = os.getenv("CLICKHOUSE_DATABASE", "analytics")
     clickhouse_user: str = os.getenv("CLICKHOUSE_USER", "default")
     clickhouse_password: str = os.getenv("CLICKHOUSE_PASSWORD", "")
+    clickhouse_raw_events_ttl_days: int = int(os.getenv("CLICKHOUSE_RAW_EVENTS_TTL_DAYS", "365"))
+    clickhouse_kafka_timestamp_compat: bool = os.getenv("CLICKHOUSE_KAFKA_TIMESTAMP_COMPAT", "false").lower() == "true"
+    clickhouse_kafka_engine_settings: ClickHouseKafkaEngineSettings = None
+    clickhouse_kafka_max_acceptable_lag: int = int(os.getenv("CLICKHOUSE_KAFKA_MAX_ACCEPTABLE_LAG", "10000"))
+    clickhouse_ingest_mode: ClickHouseIngestMode = ClickHouseIngestMode(
+        os.getenv("CLICKHOUSE_INGEST_MODE", "kafka_engine")
+    )
+    clickhouse_loader_group_id: str = os.getenv("CLICKHOUSE_LOADER_GROUP_ID", "clickhouse_loader")
+    clickhouse_loader_batch_size: int = int(os.getenv("CLICKHOUSE_LOADER_BATCH_SIZE", "50000"))
+    clickhouse_loader_flush_interval_seconds: float = float(os.getenv("CLICKHOUSE_LOADER_FLUSH_INTERVAL_SECONDS", "1"))
+    clickhouse_loader_max_poll_records: int = int(os.getenv("CLICKHOUSE_LOADER_MAX_POLL_RECORDS", "10000"))
+    clickhouse_loader_partition_queue_size: int = int(os.getenv("CLICKHOUSE_LOADER_PARTITION_QUEUE_SIZE", "16"))
+    clickhouse_loader_processes: int = int(os.getenv("CLICKHOUSE_LOADER_PROCESSES", "1"))
+    clickhouse_loader_max_insert_attempts: int = int(os.getenv("CLICKHOUSE_LOADER_MAX_INSERT_ATTEMPTS", "6"))
+    clickhouse_pool_min_size: int = int(os.getenv("CLICKHOUSE_POOL_MIN_SIZE", "2"))
+    clickhouse_pool_max_size: int = int(os.getenv("CLICKHOUSE_POOL_MAX_SIZE", "10"))
+    clickhouse_pool_acquire_timeout_seconds: float = float(os.getenv("CLICKHOUSE_POOL_ACQUIRE_TIMEOUT_SECONDS", "5"))
+    clickhouse_pool_max_idle_seconds: float = float(os.getenv("CLICKHOUSE_POOL_MAX_IDLE_SECONDS", "300"))
+    clickhouse_pool_health_check_interval_seconds: float = float(
+        os.getenv("CLICKHOUSE_POOL_HEALTH_CHECK_INTERVAL_SECONDS", "30")
+    )
+    dashboard_max_concurrency: int = int(os.getenv("DASHBOARD_MAX_CONCURRENCY", "8"))
+    dashboard_metric_timeout_seconds: float = float(os.getenv("DASHBOARD_METRIC_TIMEOUT_SECONDS", "10"))
+    dashboard_cache_max_entries: int = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "1024"))
+    dashboard_cache_default_ttl_seconds: float = float(os.getenv("DASHBOARD_CACHE_DEFAULT_TTL_SECONDS", "60"))
+    dashboard_shared_cache_dir: str = os.getenv("DASHBOARD_SHARED_CACHE_DIR", "")
+    dashboard_shared_cache_lock_timeout_seconds: float = float(
+        os.getenv("DASHBOARD_SHARED_CACHE_LOCK_TIMEOUT_SECONDS", "10")
+    )
+    dashboard_max_points: int = int(os.getenv("DASHBOARD_MAX_POINTS", "500"))
+    dashboard_default_range_days: int = int(os.getenv("DASHBOARD_DEFAULT_RANGE_DAYS", "7"))
+    dashboard_trend_late_arrival_seconds: int = int(os.getenv("DASHBOARD_TREND_LATE_ARRIVAL_SECONDS", "600"))
+    dashboard_trend_full_refresh_seconds: float = float(os.getenv("DASHBOARD_TREND_FULL_REFRESH_SECONDS", "3600"))
+    dashboard_stream_interval_seconds: float = float(os.getenv("DASHBOARD_STREAM_INTERVAL_SECONDS", "5"))
+    dashboard_stream_queue_size: int = int(os.getenv("DASHBOARD_STREAM_QUEUE_SIZE", "8"))
+    dashboard_stream_keepalive_seconds: float = float(os.getenv("DASHBOARD_STREAM_KEEPALIVE_SECONDS", "15"))
+    dashboard_live_aggregation: bool = os.getenv("DASHBOARD_LIVE_AGGREGATION", "false").lower() == "true"
+    dashboard_live_retention_days: int = int(os.getenv("DASHBOARD_LIVE_RETENTION_DAYS", "2"))
+    dashboard_live_hll_precision: int = int(os.getenv("DASHBOARD_LIVE_HLL_PRECISION", "14"))
+    dashboard_sampling_factor: int = int(os.getenv("DASHBOARD_SAMPLING_FACTOR", "10"))
+    response_compression_encodings: tuple[ContentEncoding, ...] = tuple(
+        ContentEncoding(encoding.strip())
+        for encoding in os.getenv("RESPONSE_COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+        if encoding.strip()
+    )
+    response_compression_min_size: int = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
 
     def __post_init__(self) -> None:
+        if self.api_workers <= 0:
+            self.api_workers = _available_cores()
+        if self.api_workers > 1:
+            self.dashboard_live_aggregation = False
         if self.kafka_brokers is None:
             self.kafka_brokers = self.kafka_bootstrap_servers.split(",")
+        if self.kafka_producer_settings is None:
+            self.kafka_producer_settings = _load_kafka_producer_settings(self.kafka_producer_profile)
+        if self.clickhouse_kafka_engine_settings is None:
+            self.clickhouse_kafka_engine_settings = _load_clickhouse_kafka_engine_settings(self.kafka_topic_partitions)
 
 
 config = Config()
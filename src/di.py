@@ -1,20 +1,146 @@
-import asynch
 from dependency_injector import containers, providers
 
 from src.config import config
+from src.enums import ClickHouseIngestMode
+from src.migrations.kafka_ingest import KAFKA_INGEST_TABLES
+from src.repositories.cached_clickhouse_repository import CachedClickHouseRepository
+from src.repositories.clickhouse_pool import ClickHouseConnectionPool
 from src.repositories.clickhouse_repository import ClickHouseRepository
+from src.repositories.metric_cache import MetricCache
+from src.repositories.metric_freshness import METRIC_TTL_SECONDS
+from src.repositories.shared_metric_store import SharedMetricStore
+from src.services.buffered_producer import BufferedEventProducer
+from src.services.dashboard.dashboard_broadcaster import DashboardBroadcaster
 from src.services.dashboard.dashboard_service import DashboardService
+from src.services.dashboard.live_metric_aggregator import LiveMetricAggregator
+from src.services.event_registry import EVENT_ROUTES, EventRegistry
+from src.services.event_serializers import create_event_serializer
 from src.services.event_service import EventService
+from src.services.kafka_consumer_lag import KafkaConsumerLagService
+from src.services.kafka_partitioners import create_partitioner
 from src.services.kafka_producer import KafkaEventProducer
+from src.services.leader_election import LeaderLock
 
 
 class Container(containers.DeclarativeContainer):
-    clickhouse_connection = providers.Dependency()
+    leader_lock = providers.Singleton(LeaderLock, path=config.api_leader_lock_path)
 
-    kafka_producer = providers.Singleton(KafkaEventProducer, bootstrap_servers=config.kafka_bootstrap_servers)
+    clickhouse_pool = providers.Singleton(
+        ClickHouseConnectionPool,
+        host=config.clickhouse_host,
+        port=config.clickhouse_port,
+        database=config.clickhouse_database,
+        user=config.clickhouse_user,
+        password=config.clickhouse_password,
+        min_size=config.clickhouse_pool_min_size,
+        max_size=config.clickhouse_pool_max_size,
+        acquire_timeout_seconds=config.clickhouse_pool_acquire_timeout_seconds,
+        max_idle_seconds=config.clickhouse_pool_max_idle_seconds,
+        health_check_interval_seconds=config.clickhouse_pool_health_check_interval_seconds,
+    )
 
-    event_service = providers.Factory(EventService, producer=kafka_producer)
+    event_serializer = providers.Singleton(create_event_serializer, config.event_serialization_format)
 
-    clickhouse_repository = providers.Singleton(ClickHouseRepository, connection=clickhouse_connection)
+    event_registry = providers.Singleton(
+        EventRegistry,
+        routes=EVENT_ROUTES,
+        serializer=event_serializer,
+        key_field=config.kafka_message_key_field,
+    )
 
-    dashboard_service = providers.Factory(DashboardService, clickhouse_repository=clickhouse_repository)
+    kafka_partitioner = providers.Singleton(create_partitioner, config.kafka_partitioner)
+
+    kafka_producer = providers.Singleton(
+        KafkaEventProducer,
+        bootstrap_servers=config.kafka_bootstrap_servers,
+        settings=config.kafka_producer_settings,
+        partitioner=kafka_partitioner,
+    )
+
+    buffered_kafka_producer = providers.Singleton(
+        BufferedEventProducer,
+        producer=kafka_producer,
+        capacity=config.event_buffer_capacity,
+        drain_batch_size=config.event_buffer_drain_batch_size,
+        drain_workers=config.event_buffer_drain_workers,
+        overflow_policy=config.event_buffer_overflow_policy,
+        block_timeout_seconds=config.event_buffer_block_timeout_seconds,
+    )
+
+    event_producer = providers.Selector(
+        lambda: config.event_producer_mode.value,
+        direct=kafka_producer,
+        buffered=buffered_kafka_producer,
+    )
+
+    kafka_consumer_lag_service = providers.Singleton(
+        KafkaConsumerLagService,
+        bootstrap_servers=config.kafka_bootstrap_servers,
+        consumer_groups={
+            table.topic: (
+                table.consumer_group
+                if config.clickhouse_ingest_mode == ClickHouseIngestMode.KAFKA_ENGINE
+                else config.clickhouse_loader_group_id
+            )
+            for table in KAFKA_INGEST_TABLES
+        },
+        max_acceptable_lag=config.clickhouse_kafka_max_acceptable_lag,
+    )
+
+    live_metric_aggregator = providers.Singleton(
+        LiveMetricAggregator,
+        retention_days=config.dashboard_live_retention_days,
+        precision=config.dashboard_live_hll_precision,
+    )
+
+    event_service = providers.Factory(
+        EventService,
+        producer=event_producer,
+        registry=event_registry,
+        live_aggregator=live_metric_aggregator if config.dashboard_live_aggregation else None,
+    )
+
+    clickhouse_repository = providers.Singleton(
+        ClickHouseRepository,
+        pool=clickhouse_pool,
+        max_concurrency=config.dashboard_max_concurrency,
+        sampling_factor=config.dashboard_sampling_factor,
+    )
+
+    shared_metric_store = providers.Singleton(
+        SharedMetricStore,
+        directory=config.dashboard_shared_cache_dir,
+        lock_timeout_seconds=config.dashboard_shared_cache_lock_timeout_seconds,
+    )
+
+    metric_cache = providers.Singleton(
+        MetricCache,
+        max_entries=config.dashboard_cache_max_entries,
+        shared_store=shared_metric_store if config.dashboard_shared_cache_dir else None,
+    )
+
+    cached_clickhouse_repository = providers.Singleton(
+        CachedClickHouseRepository,
+        repository=clickhouse_repository,
+        cache=metric_cache,
+        ttl_seconds=METRIC_TTL_SECONDS,
+        default_ttl_seconds=config.dashboard_cache_default_ttl_seconds,
+        late_arrival_seconds=config.dashboard_trend_late_arrival_seconds,
+        full_refresh_seconds=config.dashboard_trend_full_refresh_seconds,
+    )
+
+    dashboard_service = providers.Factory(
+        DashboardService,
+        clickhouse_repository=cached_clickhouse_repository,
+        metric_timeout_seconds=config.dashboard_metric_timeout_seconds,
+        max_points=config.dashboard_max_points,
+        default_range_days=config.dashboard_default_range_days,
+        live_aggregator=live_metric_aggregator if config.dashboard_live_aggregation else None,
+    )
+
+    dashboard_broadcaster = providers.Singleton(
+        DashboardBroadcaster,
+        dashboard_service=dashboard_service,
+        interval_seconds=config.dashboard_stream_interval_seconds,
+        subscriber_queue_size=config.dashboard_stream_queue_size,
+    )
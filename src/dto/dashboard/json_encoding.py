@@ -0,0 +1,19 @@
+from decimal import Decimal
+
+import orjson
+
+from src.dto.dashboard.metric_data import ColumnarRows
+
+
+def encode_default(value: object) -> object:
+    match value:
+        case ColumnarRows():
+            return value.to_json_fragment(encode_default)
+        case Decimal():
+            return float(value)
+        case _:
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dump_dashboard_json(content: object) -> bytes:
+    return orjson.dumps(content, default=encode_default, option=orjson.OPT_NON_STR_KEYS)
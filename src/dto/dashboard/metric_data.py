@@ -1,101 +1,180 @@
-from dataclasses import dataclass
-from datetime import date
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, fields, replace
+from datetime import UTC, date, datetime, time
+from typing import Generic, Self, TypeVar
+
+import orjson
+from pydantic_core import SchemaSerializer, core_schema
+
+RowT = TypeVar("RowT")
 
 
 class MetricData:
-    pass
+    __slots__ = ()
+
+
+class ColumnarRows(Generic[RowT]):
+    __slots__ = ("row_type", "fields", "columns", "_encoded")
+
+    def __init__(self, row_type: type[RowT], columns: Sequence[Sequence[object]]):
+        self.row_type = row_type
+        self.fields = tuple(field.name for field in fields(row_type))
+        self.columns = tuple(columns) if columns else tuple(() for _ in self.fields)
+        if len(self.columns) != len(self.fields):
+            raise ValueError(f"{row_type.__name__} expects {len(self.fields)} columns, got {len(self.columns)}")
+        self._encoded: bytes | None = None
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def to_records(self) -> list[dict[str, object]]:
+        names = self.fields
+        return [dict(zip(names, row)) for row in zip(*self.columns)]
+
+    def to_json_fragment(self, default: Callable[[object], object]) -> orjson.Fragment:
+        if self._encoded is None:
+            self._encoded = orjson.dumps(self.to_records(), default=default)
+        return orjson.Fragment(self._encoded)
+
+
+ColumnarRows.__pydantic_serializer__ = SchemaSerializer(
+    core_schema.any_schema(serialization=core_schema.plain_serializer_function_ser_schema(ColumnarRows.to_records))
+)
+
+
+def _bucket_key(bucket: date) -> datetime:
+    if isinstance(bucket, datetime):
+        return bucket if bucket.tzinfo is None else bucket.astimezone(UTC).replace(tzinfo=None)
+    return datetime.combine(bucket, time.min)
+
+
+class TimeSeriesData(MetricData):
+    __slots__ = ()
+
+    points: ColumnarRows
+
+    @property
+    def last_bucket(self) -> date | None:
+        buckets = self.points.columns[0]
+        return buckets[-1] if buckets else None
+
+    def since(self, cursor: date) -> Self:
+        cursor_key = _bucket_key(cursor)
+        rows = [row for row in zip(*self.points.columns) if _bucket_key(row[0]) >= cursor_key]
+        return self._with_rows(rows)
+
+    def merged_with(self, recent: Self) -> Self:
+        recent_buckets = set(recent.points.columns[0])
+        rows = [row for row in zip(*self.points.columns) if row[0] not in recent_buckets]
+        rows.extend(zip(*recent.points.columns))
+        rows.sort(key=lambda row: _bucket_key(row[0]))
+        return self._with_rows(rows)
+
+    def _with_rows(self, rows: list[tuple]) -> Self:
+        return replace(self, points=ColumnarRows(self.points.row_type, list(zip(*rows))))
+
+
+def series_cursor(metrics: Iterable[MetricData]) -> date | None:
+    buckets = [data.last_bucket for data in metrics if isinstance(data, TimeSeriesData)]
+    buckets = [bucket for bucket in buckets if bucket is not None]
+    return min(buckets, key=_bucket_key) if buckets else None
+
+
+@dataclass(frozen=True, slots=True)
+class MetricUnavailableData(MetricData):
+    error: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DauData(MetricData):
     value: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WauData(MetricData):
     value: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MauData(MetricData):
     value: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NewRegistrationsTodayData(MetricData):
     value: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DailyRevenueData(MetricData):
     value: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AverageOrderValueData(MetricData):
     value: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ArpuSevenDaysData(MetricData):
     value: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TotalTransactionsTodayData(MetricData):
     value: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RevenuePoint:
     date: date
     revenue: float
 
 
-@dataclass
-class RevenueTrendThirtyDaysData(MetricData):
-    points: list[RevenuePoint]
+@dataclass(frozen=True, slots=True)
+class RevenueTrendThirtyDaysData(TimeSeriesData):
+    points: ColumnarRows[RevenuePoint]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UserActivityPoint:
     date: date
     active_users: int
 
 
-@dataclass
-class UserActivityTrendThirtyDaysData(MetricData):
-    points: list[UserActivityPoint]
+@dataclass(frozen=True, slots=True)
+class UserActivityTrendThirtyDaysData(TimeSeriesData):
+    points: ColumnarRows[UserActivityPoint]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PageViewRow:
     page: str
     views: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TopPagesByViewsData(MetricData):
-    rows: list[PageViewRow]
+    rows: ColumnarRows[PageViewRow]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CartAbandonmentRateData(MetricData):
     value: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SearchQueryRow:
     query: str
     search_count: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SearchQueriesData(MetricData):
-    rows: list[SearchQueryRow]
+    rows: ColumnarRows[SearchQueryRow]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FunnelPoint:
     time: date
     page_views: int
@@ -103,117 +182,117 @@ class FunnelPoint:
     searches: int
 
 
-@dataclass
-class UserJourneyFunnelData(MetricData):
-    points: list[FunnelPoint]
+@dataclass(frozen=True, slots=True)
+class UserJourneyFunnelData(TimeSeriesData):
+    points: ColumnarRows[FunnelPoint]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CurrencyVolumeRow:
     currency: str
     transactions: int
     total_amount: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TransactionVolumeByCurrencyData(MetricData):
-    rows: list[CurrencyVolumeRow]
+    rows: ColumnarRows[CurrencyVolumeRow]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ClickedElementRow:
     element_name: str
     clicks: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MostClickedElementsData(MetricData):
-    rows: list[ClickedElementRow]
+    rows: ColumnarRows[ClickedElementRow]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RegistrationPoint:
     date: date
     registrations: int
 
 
-@dataclass
-class UserRegistrationTrendData(MetricData):
-    points: list[RegistrationPoint]
+@dataclass(frozen=True, slots=True)
+class UserRegistrationTrendData(TimeSeriesData):
+    points: ColumnarRows[RegistrationPoint]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FilterUsageRow:
     filter_name: str
     filter_value: str
     usage_count: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FilterUsageData(MetricData):
-    rows: list[FilterUsageRow]
+    rows: ColumnarRows[FilterUsageRow]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConversionRateCartToPurchaseData(MetricData):
     value: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UserEngagementScoreData(MetricData):
     value: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MostActiveEventTypeData(MetricData):
     value: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TotalPageViewsData(MetricData):
     value: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProductRow:
     product_id: str
     cart_additions: int
     unique_users: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TopPerformingProductsData(MetricData):
-    rows: list[ProductRow]
+    rows: ColumnarRows[ProductRow]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HourlyActivityRow:
     hour: int
     events: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ActivityByHourData(MetricData):
-    rows: list[HourlyActivityRow]
+    rows: ColumnarRows[HourlyActivityRow]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EventDistributionRow:
     event_type: str
     value: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EventTypeDistributionData(MetricData):
-    rows: list[EventDistributionRow]
+    rows: ColumnarRows[EventDistributionRow]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ActivityPoint:
     time: date
     events: int
 
 
-@dataclass
-class DailyActivityTrendData(MetricData):
-    points: list[ActivityPoint]
+@dataclass(frozen=True, slots=True)
+class DailyActivityTrendData(TimeSeriesData):
+    points: ColumnarRows[ActivityPoint]
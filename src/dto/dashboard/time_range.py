@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.enums import MetricGranularity
+
+
+@dataclass(frozen=True, slots=True)
+class MetricTimeRange:
+    start: datetime
+    end: datetime
+    granularity: MetricGranularity
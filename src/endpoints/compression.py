@@ -0,0 +1,100 @@
+from collections.abc import Callable
+
+import cramjam
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.enums import ContentEncoding
+
+COMPRESSORS: dict[ContentEncoding, Callable[[bytes], bytes]] = {
+    ContentEncoding.ZSTD: lambda body: bytes(cramjam.zstd.compress(body, level=3)),
+    ContentEncoding.BROTLI: lambda body: bytes(cramjam.brotli.compress(body, level=5)),
+    ContentEncoding.GZIP: lambda body: bytes(cramjam.gzip.compress(body, level=6)),
+}
+
+UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream",)
+
+
+def negotiate_encoding(accept_encoding: str, encodings: tuple[ContentEncoding, ...]) -> ContentEncoding | None:
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name:
+            weights[name.strip().lower()] = weight
+
+    candidates = [encoding for encoding in encodings if weights.get(encoding.value, weights.get("*", 0.0)) > 0]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda encoding: weights.get(encoding.value, weights.get("*", 0.0)))
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, encodings: tuple[ContentEncoding, ...], minimum_size: int):
+        self.app = app
+        self.encodings = encodings
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        responder = _CompressingResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, send: Send, encoding: ContentEncoding | None, minimum_size: int):
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        self._passthrough = True
+        start, self._start = self._start, None
+        body = message.get("body", b"")
+        headers = MutableHeaders(raw=start["headers"])
+        if self._is_compressible(headers):
+            headers.add_vary_header("Accept-Encoding")
+        if not self._should_compress(headers, message, body):
+            await self._send(start)
+            await self._send(message)
+            return
+
+        body = COMPRESSORS[self._encoding](body)
+        headers["Content-Encoding"] = self._encoding.value
+        headers["Content-Length"] = str(len(body))
+        await self._send(start)
+        await self._send({**message, "body": body})
+
+    def _should_compress(self, headers: Headers, message: Message, body: bytes) -> bool:
+        return (
+            self._encoding is not None
+            and not message.get("more_body", False)
+            and len(body) >= self._minimum_size
+            and self._is_compressible(headers)
+        )
+
+    @staticmethod
+    def _is_compressible(headers: Headers) -> bool:
+        return "content-encoding" not in headers and not headers.get("content-type", "").startswith(
+            UNCOMPRESSED_MEDIA_TYPES
+        )
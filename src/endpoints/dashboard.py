@@ -1,17 +1,169 @@
+import asyncio
+import hashlib
+from collections.abc import AsyncIterator
+from datetime import date, datetime
+
+import orjson
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 
+from src.config import config
 from src.di import Container
-from src.endpoints.models.dashboard.responses import DashboardResponse
+from src.dto.dashboard.metric_data import MetricData, MetricUnavailableData, series_cursor
+from src.dto.dashboard.time_range import MetricTimeRange
+from src.endpoints.models.dashboard.requests import DashboardRequest
+from src.endpoints.models.dashboard.responses import DashboardJSONResponse, DashboardResponse
+from src.enums import MetricAccuracy, MetricGranularity, MetricType
+from src.repositories.metric_freshness import METRIC_TTL_SECONDS
+from src.repositories.metric_plans import DISTINCT_USER_METRICS
+from src.repositories.metric_query_planner import distinct_relative_error
+from src.services.dashboard.dashboard_broadcaster import DashboardBroadcaster, DashboardSubscription, DashboardUpdate
 from src.services.dashboard.dashboard_service import DashboardServiceInterface
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
+COUNT_METRICS = frozenset({MetricType.DAU, MetricType.WAU, MetricType.MAU})
+
+
+def _resolve_time_range(
+    dashboard_service: DashboardServiceInterface,
+    start: datetime | None,
+    end: datetime | None,
+    granularity: MetricGranularity | None,
+) -> MetricTimeRange | None:
+    try:
+        return dashboard_service.resolve_time_range(start, end, granularity)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+def _accuracy_report(accuracy: MetricAccuracy, metric_data: dict[MetricType, MetricData]) -> dict[str, object]:
+    relative_errors = {
+        metric_type: distinct_relative_error(
+            accuracy,
+            config.dashboard_sampling_factor,
+            getattr(data, "value", None) if metric_type in COUNT_METRICS else None,
+        )
+        for metric_type, data in metric_data.items()
+        if metric_type in DISTINCT_USER_METRICS and not isinstance(data, MetricUnavailableData)
+    }
+    return {"mode": accuracy, "relative_errors": relative_errors}
+
+
+def _dashboard_response(
+    metric_data: dict[MetricType, MetricData], time_range: MetricTimeRange | None, accuracy: MetricAccuracy
+) -> DashboardJSONResponse:
+    return DashboardJSONResponse(
+        {
+            "metrics": metric_data,
+            "time_range": time_range,
+            "cursor": series_cursor(metric_data.values()),
+            "accuracy": _accuracy_report(accuracy, metric_data),
+        }
+    )
+
+
+def _cache_control(metric_data: dict[MetricType, MetricData]) -> str:
+    if any(isinstance(data, MetricUnavailableData) for data in metric_data.values()):
+        return "no-cache"
+    max_age = min(
+        (
+            METRIC_TTL_SECONDS.get(metric_type, config.dashboard_cache_default_ttl_seconds)
+            for metric_type in metric_data
+        ),
+        default=config.dashboard_cache_default_ttl_seconds,
+    )
+    return f"max-age={int(max_age)}, must-revalidate"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == opaque_tag
+        for candidate in (item.strip() for item in if_none_match.split(","))
+    )
+
+
+def _conditional_response(
+    request: Request, response: DashboardJSONResponse, metric_data: dict[MetricType, MetricData]
+) -> Response:
+    headers = {
+        "ETag": f'W/"{hashlib.blake2b(response.body, digest_size=16).hexdigest()}"',
+        "Cache-Control": _cache_control(metric_data),
+    }
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
 
-@router.get("", response_model=DashboardResponse)
+
+def _stream_event(update: DashboardUpdate) -> bytes:
+    metrics = {metric_type.value: orjson.Fragment(data) for metric_type, data in update.metrics.items()}
+    return f"event: {update.kind}\nid: {update.tick}\ndata: ".encode() + orjson.dumps({"metrics": metrics}) + b"\n\n"
+
+
+async def _stream_updates(
+    request: Request,
+    broadcaster: DashboardBroadcaster,
+    subscription: DashboardSubscription,
+    keepalive_seconds: float,
+) -> AsyncIterator[bytes]:
+    try:
+        while not await request.is_disconnected():
+            try:
+                update = await asyncio.wait_for(subscription.get(), timeout=keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            yield _stream_event(update)
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+@inject
+async def stream_dashboard_metrics(
+    request: Request,
+    metrics: list[MetricType] | None = Query(None),
+    broadcaster: DashboardBroadcaster = Depends(Provide[Container.dashboard_broadcaster]),
+) -> StreamingResponse:
+    subscription = broadcaster.subscribe(frozenset(metrics) if metrics else None)
+    return StreamingResponse(
+        _stream_updates(request, broadcaster, subscription, config.dashboard_stream_keepalive_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("", response_model=DashboardResponse, response_class=DashboardJSONResponse)
 @inject
 async def get_dashboard_metrics(
+    request: Request,
+    metrics: list[MetricType] | None = Query(None),
+    start: datetime | None = Query(None, alias="from"),
+    end: datetime | None = Query(None, alias="to"),
+    granularity: MetricGranularity | None = Query(None),
+    since: datetime | date | None = Query(None),
+    accuracy: MetricAccuracy = Query(MetricAccuracy.SKETCH),
+    dashboard_service: DashboardServiceInterface = Depends(Provide[Container.dashboard_service]),
+) -> Response:
+    time_range = _resolve_time_range(dashboard_service, start, end, granularity)
+    if metrics:
+        metric_data = await dashboard_service.get_metrics(metrics, time_range, since, accuracy)
+    else:
+        metric_data = await dashboard_service.get_all_metrics(time_range, since, accuracy)
+    return _conditional_response(request, _dashboard_response(metric_data, time_range, accuracy), metric_data)
+
+
+@router.post("", response_model=DashboardResponse, response_class=DashboardJSONResponse)
+@inject
+async def query_dashboard_metrics(
+    request: DashboardRequest,
     dashboard_service: DashboardServiceInterface = Depends(Provide[Container.dashboard_service]),
-) -> DashboardResponse:
-    metric_data = await dashboard_service.get_all_metrics()
-    return DashboardResponse(metrics=metric_data)
+) -> DashboardJSONResponse:
+    time_range = _resolve_time_range(dashboard_service, request.start, request.end, request.granularity)
+    metric_data = await dashboard_service.get_metrics(request.metrics, time_range, request.since, request.accuracy)
+    return _dashboard_response(metric_data, time_range, request.accuracy)
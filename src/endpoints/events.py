@@ -1,20 +1,14 @@
+import logging
+from collections.abc import AsyncIterator
+
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import TypeAdapter, ValidationError
 
 from src.di import Container
-from src.dto.events import (
-    ElementClickEventDto,
-    FilterAppliedEventDto,
-    FormSubmitEventDto,
-    ItemAddedToCartEventDto,
-    ItemRemovedFromCartEventDto,
-    PageViewEventDto,
-    SearchEventDto,
-    TransactionEventDto,
-    UserLoginEventDto,
-    UserRegisteredEventDto,
-)
+from src.endpoints.json_stream import JsonArrayStreamError, JsonArrayStreamParser
 from src.endpoints.models.events import (
+    BatchEvent,
     ElementClickEvent,
     FilterAppliedEvent,
     FormSubmitEvent,
@@ -26,19 +20,27 @@ from src.endpoints.models.events import (
     UserLoginEvent,
     UserRegisteredEvent,
 )
-from src.endpoints.models.responses import SuccessResponse
+from src.endpoints.models.responses import BatchEventsResponse, BatchItemError, SuccessResponse
+from src.services.buffered_producer import EventBufferFullError
 from src.services.event_service import EventService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/events", tags=["events"])
 
+BATCH_FLUSH_SIZE = 500
+BATCH_MAX_ITEM_CHARS = 1 << 20
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl")
+
+batch_event_adapter: TypeAdapter[BatchEvent] = TypeAdapter(BatchEvent)
+
 
 @router.post("/user-registered", response_model=SuccessResponse)
 @inject
 async def user_registered(
     event: UserRegisteredEvent, event_service: EventService = Depends(Provide[Container.event_service])
 ) -> SuccessResponse:
-    dto = UserRegisteredEventDto(user_id=event.user_id, timestamp=event.timestamp)
-    await event_service.process_event(dto)
+    await event_service.process_event(event)
     return SuccessResponse()
 
 
@@ -47,8 +49,7 @@ async def user_registered(
 async def user_login(
     event: UserLoginEvent, event_service: EventService = Depends(Provide[Container.event_service])
 ) -> SuccessResponse:
-    dto = UserLoginEventDto(user_id=event.user_id, timestamp=event.timestamp)
-    await event_service.process_event(dto)
+    await event_service.process_event(event)
     return SuccessResponse()
 
 
@@ -57,14 +58,7 @@ async def user_login(
 async def transaction(
     event: TransactionEvent, event_service: EventService = Depends(Provide[Container.event_service])
 ) -> SuccessResponse:
-    dto = TransactionEventDto(
-        user_id=event.user_id,
-        timestamp=event.timestamp,
-        transaction_id=event.transaction_id,
-        amount=event.amount,
-        currency=event.currency,
-    )
-    await event_service.process_event(dto)
+    await event_service.process_event(event)
     return SuccessResponse()
 
 
@@ -73,10 +67,7 @@ async def transaction(
 async def element_click(
     event: ElementClickEvent, event_service: EventService = Depends(Provide[Container.event_service])
 ) -> SuccessResponse:
-    dto = ElementClickEventDto(
-        user_id=event.user_id, timestamp=event.timestamp, element_name=event.element_name, page=event.page
-    )
-    await event_service.process_event(dto)
+    await event_service.process_event(event)
     return SuccessResponse()
 
 
@@ -85,8 +76,7 @@ async def element_click(
 async def search(
     event: SearchEvent, event_service: EventService = Depends(Provide[Container.event_service])
 ) -> SuccessResponse:
-    dto = SearchEventDto(user_id=event.user_id, timestamp=event.timestamp, query=event.query)
-    await event_service.process_event(dto)
+    await event_service.process_event(event)
     return SuccessResponse()
 
 
@@ -95,8 +85,7 @@ async def search(
 async def page_view(
     event: PageViewEvent, event_service: EventService = Depends(Provide[Container.event_service])
 ) -> SuccessResponse:
-    dto = PageViewEventDto(user_id=event.user_id, timestamp=event.timestamp, page=event.page)
-    await event_service.process_event(dto)
+    await event_service.process_event(event)
     return SuccessResponse()
 
 
@@ -105,8 +94,7 @@ async def page_view(
 async def form_submit(
     event: FormSubmitEvent, event_service: EventService = Depends(Provide[Container.event_service])
 ) -> SuccessResponse:
-    dto = FormSubmitEventDto(user_id=event.user_id, timestamp=event.timestamp, form_name=event.form_name)
-    await event_service.process_event(dto)
+    await event_service.process_event(event)
     return SuccessResponse()
 
 
@@ -115,8 +103,7 @@ async def form_submit(
 async def item_added_to_cart(
     event: ItemAddedToCartEvent, event_service: EventService = Depends(Provide[Container.event_service])
 ) -> SuccessResponse:
-    dto = ItemAddedToCartEventDto(user_id=event.user_id, timestamp=event.timestamp, item_id=event.item_id)
-    await event_service.process_event(dto)
+    await event_service.process_event(event)
     return SuccessResponse()
 
 
@@ -125,8 +112,7 @@ async def item_added_to_cart(
 async def item_removed_from_cart(
     event: ItemRemovedFromCartEvent, event_service: EventService = Depends(Provide[Container.event_service])
 ) -> SuccessResponse:
-    dto = ItemRemovedFromCartEventDto(user_id=event.user_id, timestamp=event.timestamp, item_id=event.item_id)
-    await event_service.process_event(dto)
+    await event_service.process_event(event)
     return SuccessResponse()
 
 
@@ -135,12 +121,124 @@ async def item_removed_from_cart(
 async def filter_applied(
     event: FilterAppliedEvent, event_service: EventService = Depends(Provide[Container.event_service])
 ) -> SuccessResponse:
-    dto = FilterAppliedEventDto(
-        user_id=event.user_id,
-        timestamp=event.timestamp,
-        filter_name=event.filter_name,
-        filter_value=event.filter_value,
-        page=event.page,
-    )
-    await event_service.process_event(dto)
+    await event_service.process_event(event)
     return SuccessResponse()
+
+
+@router.post(
+    "/batch",
+    response_model=BatchEventsResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+            "required": True,
+        }
+    },
+)
+@inject
+async def batch(
+    request: Request, event_service: EventService = Depends(Provide[Container.event_service])
+) -> BatchEventsResponse:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        items = _iter_ndjson_items(request)
+    else:
+        items = _iter_json_array_items(request)
+
+    errors: list[BatchItemError] = []
+    pending: list[tuple[int, BatchEvent]] = []
+    accepted = 0
+
+    async for index, event in _validate_batch_items(items, errors):
+        pending.append((index, event))
+        if len(pending) >= BATCH_FLUSH_SIZE:
+            accepted += await _flush_batch(pending, event_service, errors)
+            pending = []
+
+    if pending:
+        accepted += await _flush_batch(pending, event_service, errors)
+
+    errors.sort(key=lambda item_error: item_error.index)
+    return BatchEventsResponse(accepted=accepted, rejected=len(errors), errors=errors)
+
+
+async def _iter_ndjson_items(request: Request) -> AsyncIterator[bytes | object]:
+    buffer = bytearray()
+    async for chunk in request.stream():
+        start = 0
+        newline = chunk.find(b"\n")
+        while newline != -1:
+            _extend_ndjson_line(buffer, chunk[start:newline])
+            if buffer.strip():
+                yield bytes(buffer)
+            buffer.clear()
+            start = newline + 1
+            newline = chunk.find(b"\n", start)
+        _extend_ndjson_line(buffer, chunk[start:])
+    if buffer.strip():
+        yield bytes(buffer)
+
+
+def _extend_ndjson_line(buffer: bytearray, data: bytes) -> None:
+    if len(buffer) + len(data) > BATCH_MAX_ITEM_CHARS:
+        raise JsonArrayStreamError(f"Batch item exceeds {BATCH_MAX_ITEM_CHARS} characters")
+    buffer += data
+
+
+async def _iter_json_array_items(request: Request) -> AsyncIterator[bytes | object]:
+    parser = JsonArrayStreamParser(max_item_chars=BATCH_MAX_ITEM_CHARS)
+    async for chunk in request.stream():
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.feed(b"", final=True):
+        yield item
+
+
+async def _validate_batch_items(
+    items: AsyncIterator[bytes | object], errors: list[BatchItemError]
+) -> AsyncIterator[tuple[int, BatchEvent]]:
+    index = 0
+    try:
+        async for item in items:
+            try:
+                if isinstance(item, bytes):
+                    event = batch_event_adapter.validate_json(item)
+                else:
+                    event = batch_event_adapter.validate_python(item)
+            except ValidationError as e:
+                errors.append(BatchItemError(index=index, error=_format_validation_error(e)))
+            else:
+                yield index, event
+            index += 1
+    except JsonArrayStreamError as e:
+        if index == 0:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        errors.append(BatchItemError(index=index, error=str(e)))
+
+
+async def _flush_batch(
+    pending: list[tuple[int, BatchEvent]], event_service: EventService, errors: list[BatchItemError]
+) -> int:
+    try:
+        await event_service.process_events([event for _, event in pending])
+    except EventBufferFullError as e:
+        logger.warning(f"Event buffer accepted {e.accepted} of {len(pending)} batch events: {e}")
+        errors.extend(
+            BatchItemError(index=index, error=f"Failed to enqueue event: {e}") for index, _ in pending[e.accepted :]
+        )
+        return e.accepted
+    except Exception as e:
+        logger.exception(f"Failed to enqueue batch of {len(pending)} events: {e}")
+        errors.extend(BatchItemError(index=index, error=f"Failed to enqueue event: {e}") for index, _ in pending)
+        return 0
+    return len(pending)
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" if item["loc"] else item["msg"]
+        for item in error.errors()
+    )
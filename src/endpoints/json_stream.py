@@ -0,0 +1,86 @@
+import codecs
+import json
+from enum import Enum, auto
+
+JSON_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayStreamError(ValueError):
+    pass
+
+
+class _ParserState(Enum):
+    START = auto()
+    FIRST_ITEM = auto()
+    ITEM = auto()
+    SEPARATOR = auto()
+    DONE = auto()
+
+
+class JsonArrayStreamParser:
+    def __init__(self, max_item_chars: int):
+        self._max_item_chars = max_item_chars
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = _ParserState.START
+
+    def feed(self, chunk: bytes, final: bool = False) -> list[object]:
+        try:
+            self._buffer += self._text_decoder.decode(chunk, final)
+        except UnicodeDecodeError as e:
+            raise JsonArrayStreamError(f"Invalid UTF-8 in JSON body: {e}") from e
+
+        items, position = self._parse(final)
+        self._buffer = self._buffer[position:]
+        if len(self._buffer) > self._max_item_chars:
+            raise JsonArrayStreamError(f"Batch item exceeds {self._max_item_chars} characters")
+        if final and self._state != _ParserState.DONE:
+            if self._state == _ParserState.START:
+                raise JsonArrayStreamError("Expected a JSON array of events")
+            raise JsonArrayStreamError("Unexpected end of JSON body")
+        return items
+
+    def _parse(self, final: bool) -> tuple[list[object], int]:
+        buffer = self._buffer
+        items: list[object] = []
+        position = 0
+        while True:
+            position = _skip_whitespace(buffer, position)
+            if position == len(buffer):
+                return items, position
+
+            if self._state == _ParserState.START:
+                if buffer[position] != "[":
+                    raise JsonArrayStreamError("Expected a JSON array of events")
+                position += 1
+                self._state = _ParserState.FIRST_ITEM
+            elif self._state == _ParserState.FIRST_ITEM and buffer[position] == "]":
+                position += 1
+                self._state = _ParserState.DONE
+            elif self._state in (_ParserState.FIRST_ITEM, _ParserState.ITEM):
+                try:
+                    item, end = self._json_decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as e:
+                    if final:
+                        raise JsonArrayStreamError(f"Invalid JSON body: {e}") from e
+                    return items, position
+                if _skip_whitespace(buffer, end) == len(buffer) and not final:
+                    return items, position
+                items.append(item)
+                position = end
+                self._state = _ParserState.SEPARATOR
+            elif self._state == _ParserState.SEPARATOR:
+                separator = buffer[position]
+                if separator not in ",]":
+                    raise JsonArrayStreamError(f"Expected ',' or ']' in JSON body, got {separator!r}")
+                position += 1
+                self._state = _ParserState.ITEM if separator == "," else _ParserState.DONE
+            else:
+                raise JsonArrayStreamError("Unexpected data after the JSON array")
+
+
+def _skip_whitespace(buffer: str, position: int) -> int:
+    while position < len(buffer) and buffer[position] in JSON_WHITESPACE:
+        position += 1
+    return position
@@ -1,7 +1,14 @@
-from pydantic import BaseModel
+from datetime import date, datetime
 
-from src.enums import MetricType
+from pydantic import BaseModel, Field
+
+from src.enums import MetricAccuracy, MetricGranularity, MetricType
 
 
 class DashboardRequest(BaseModel):
-    metrics: list[MetricType]
+    metrics: list[MetricType] = Field(min_length=1)
+    start: datetime | None = Field(None, alias="from")
+    end: datetime | None = Field(None, alias="to")
+    granularity: MetricGranularity | None = None
+    since: datetime | date | None = None
+    accuracy: MetricAccuracy = MetricAccuracy.SKETCH
@@ -1,10 +1,35 @@
-from pydantic import BaseModel, ConfigDict
+from datetime import date, datetime
 from typing import Any
 
-from src.enums import MetricType
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict
+
+from src.dto.dashboard.json_encoding import dump_dashboard_json
+from src.enums import MetricAccuracy, MetricGranularity, MetricType
+
+
+class DashboardTimeRangeResponse(BaseModel):
+    start: datetime
+    end: datetime
+    granularity: MetricGranularity
+
+
+class DashboardAccuracyResponse(BaseModel):
+    mode: MetricAccuracy
+    relative_errors: dict[MetricType, float | None]
 
 
 class DashboardResponse(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
-    
+
     metrics: dict[MetricType, Any]
+    time_range: DashboardTimeRangeResponse | None = None
+    cursor: datetime | date | None = None
+    accuracy: DashboardAccuracyResponse
+
+
+class DashboardJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dump_dashboard_json(content)
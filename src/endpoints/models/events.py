@@ -1,20 +1,26 @@
 from datetime import datetime
 from decimal import Decimal
+from typing import Annotated, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from src.enums import EventType
 
 
 class UserRegisteredEvent(BaseModel):
+    event_type: Literal[EventType.USER_REGISTERED] = EventType.USER_REGISTERED
     user_id: str
     timestamp: datetime
 
 
 class UserLoginEvent(BaseModel):
+    event_type: Literal[EventType.USER_LOGIN] = EventType.USER_LOGIN
     user_id: str
     timestamp: datetime
 
 
 class TransactionEvent(BaseModel):
+    event_type: Literal[EventType.TRANSACTION] = EventType.TRANSACTION
     transaction_id: str
     user_id: str
     amount: Decimal
@@ -23,6 +29,7 @@ class TransactionEvent(BaseModel):
 
 
 class ElementClickEvent(BaseModel):
+    event_type: Literal[EventType.ELEMENT_CLICK] = EventType.ELEMENT_CLICK
     user_id: str
     element_name: str
     page: str | None = None
@@ -30,38 +37,59 @@ class ElementClickEvent(BaseModel):
 
 
 class SearchEvent(BaseModel):
+    event_type: Literal[EventType.SEARCH] = EventType.SEARCH
     user_id: str
     query: str
     timestamp: datetime
 
 
 class PageViewEvent(BaseModel):
+    event_type: Literal[EventType.PAGE_VIEW] = EventType.PAGE_VIEW
     user_id: str
     page: str
     timestamp: datetime
 
 
 class FormSubmitEvent(BaseModel):
+    event_type: Literal[EventType.FORM_SUBMIT] = EventType.FORM_SUBMIT
     user_id: str
     form_name: str
     timestamp: datetime
 
 
 class ItemAddedToCartEvent(BaseModel):
+    event_type: Literal[EventType.ITEM_ADDED_TO_CART] = EventType.ITEM_ADDED_TO_CART
     user_id: str
     item_id: str
     timestamp: datetime
 
 
 class ItemRemovedFromCartEvent(BaseModel):
+    event_type: Literal[EventType.ITEM_REMOVED_FROM_CART] = EventType.ITEM_REMOVED_FROM_CART
     user_id: str
     item_id: str
     timestamp: datetime
 
 
 class FilterAppliedEvent(BaseModel):
+    event_type: Literal[EventType.FILTER_APPLIED] = EventType.FILTER_APPLIED
     user_id: str
     filter_name: str
     filter_value: str
     page: str
     timestamp: datetime
+
+
+BatchEvent = Annotated[
+    UserRegisteredEvent
+    | UserLoginEvent
+    | TransactionEvent
+    | ElementClickEvent
+    | SearchEvent
+    | PageViewEvent
+    | FormSubmitEvent
+    | ItemAddedToCartEvent
+    | ItemRemovedFromCartEvent
+    | FilterAppliedEvent,
+    Field(discriminator="event_type"),
+]
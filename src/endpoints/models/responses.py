@@ -3,3 +3,14 @@ from pydantic import BaseModel
 
 class SuccessResponse(BaseModel):
     success: bool = True
+
+
+class BatchItemError(BaseModel):
+    index: int
+    error: str
+
+
+class BatchEventsResponse(BaseModel):
+    accepted: int
+    rejected: int
+    errors: list[BatchItemError]
@@ -0,0 +1,90 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from src.enums import BufferOverflowPolicy, KafkaProducerProfile, KafkaTopic
+
+
+class ClickHousePoolStatsResponse(BaseModel):
+    min_size: int
+    max_size: int
+    size: int
+    idle: int
+    in_use: int
+    waiting: int
+    acquired_total: int
+    acquire_timeouts_total: int
+    health_check_failures_total: int
+    recycled_total: int
+    discarded_total: int
+
+
+class MetricCacheStatsResponse(BaseModel):
+    max_entries: int
+    size: int
+    in_flight: int
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    shared_hits: int
+
+
+class LiveMetricAggregatorStatsResponse(BaseModel):
+    complete_since: datetime
+    recorded: int
+    ignored: int
+    buckets: int
+    days: int
+
+
+class EventBufferStatsResponse(BaseModel):
+    capacity: int
+    size: int
+    overflow_policy: BufferOverflowPolicy
+    enqueued_total: int
+    dropped_total: int
+    rejected_total: int
+    sent_total: int
+    failed_total: int
+
+
+class HistogramResponse(BaseModel):
+    buckets: dict[str, int]
+    count: int
+    sum: float
+
+
+class KafkaProducerStatsResponse(BaseModel):
+    profile: KafkaProducerProfile
+    linger_ms: int
+    max_batch_size: int
+    compression_type: str | None
+    acks: int | str
+    enable_idempotence: bool
+    records_sent_total: int
+    records_failed_total: int
+    bytes_serialized_total: int
+    events_per_send_call: HistogramResponse
+    send_latency_ms: HistogramResponse
+
+
+class PartitionLagResponse(BaseModel):
+    partition: int
+    committed_offset: int | None
+    end_offset: int
+    lag: int
+
+
+class TopicConsumerLagResponse(BaseModel):
+    topic: KafkaTopic
+    consumer_group: str
+    lag: int
+    partitions: list[PartitionLagResponse]
+
+
+class KafkaConsumerLagResponse(BaseModel):
+    total_lag: int
+    max_acceptable_lag: int
+    keeping_up: bool
+    topics: list[TopicConsumerLagResponse]
@@ -0,0 +1,86 @@
+from dataclasses import asdict
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, HTTPException
+
+from src.config import config
+from src.di import Container
+from src.endpoints.models.stats import (
+    ClickHousePoolStatsResponse,
+    EventBufferStatsResponse,
+    KafkaConsumerLagResponse,
+    KafkaProducerStatsResponse,
+    LiveMetricAggregatorStatsResponse,
+    MetricCacheStatsResponse,
+)
+from src.repositories.clickhouse_pool import ClickHouseConnectionPool
+from src.repositories.metric_cache import MetricCache
+from src.services.buffered_producer import BufferedEventProducer
+from src.services.dashboard.live_metric_aggregator import LiveMetricAggregator
+from src.services.kafka_consumer_lag import ConsumerLagUnavailableError, KafkaConsumerLagService
+from src.services.kafka_producer import KafkaEventProducer
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/clickhouse-pool", response_model=ClickHousePoolStatsResponse)
+@inject
+async def get_clickhouse_pool_stats(
+    clickhouse_pool: ClickHouseConnectionPool = Depends(Provide[Container.clickhouse_pool]),
+) -> ClickHousePoolStatsResponse:
+    return ClickHousePoolStatsResponse(**asdict(clickhouse_pool.stats()))
+
+
+@router.get("/dashboard-cache", response_model=MetricCacheStatsResponse)
+@inject
+async def get_dashboard_cache_stats(
+    metric_cache: MetricCache = Depends(Provide[Container.metric_cache]),
+) -> MetricCacheStatsResponse:
+    return MetricCacheStatsResponse(**asdict(metric_cache.stats()))
+
+
+@router.get("/live-aggregator", response_model=LiveMetricAggregatorStatsResponse)
+@inject
+async def get_live_aggregator_stats(
+    live_aggregator: LiveMetricAggregator = Depends(Provide[Container.live_metric_aggregator]),
+) -> LiveMetricAggregatorStatsResponse:
+    if not config.dashboard_live_aggregation:
+        raise HTTPException(status_code=404, detail="Live aggregation is disabled")
+    return LiveMetricAggregatorStatsResponse(**asdict(live_aggregator.stats()))
+
+
+@router.get("/event-buffer", response_model=EventBufferStatsResponse)
+@inject
+async def get_event_buffer_stats(
+    buffered_producer: BufferedEventProducer = Depends(Provide[Container.buffered_kafka_producer]),
+) -> EventBufferStatsResponse:
+    return EventBufferStatsResponse(**asdict(buffered_producer.stats()))
+
+
+@router.get("/kafka-producer", response_model=KafkaProducerStatsResponse)
+@inject
+async def get_kafka_producer_stats(
+    kafka_producer: KafkaEventProducer = Depends(Provide[Container.kafka_producer]),
+) -> KafkaProducerStatsResponse:
+    settings = kafka_producer.settings
+    return KafkaProducerStatsResponse(
+        profile=settings.profile,
+        linger_ms=settings.linger_ms,
+        max_batch_size=settings.max_batch_size,
+        compression_type=settings.compression_type,
+        acks=settings.acks,
+        enable_idempotence=settings.enable_idempotence,
+        **asdict(kafka_producer.metrics.snapshot()),
+    )
+
+
+@router.get("/kafka-consumer-lag", response_model=KafkaConsumerLagResponse)
+@inject
+async def get_kafka_consumer_lag(
+    consumer_lag_service: KafkaConsumerLagService = Depends(Provide[Container.kafka_consumer_lag_service]),
+) -> KafkaConsumerLagResponse:
+    try:
+        report = await consumer_lag_service.get_lag()
+    except ConsumerLagUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    return KafkaConsumerLagResponse(**asdict(report))
@@ -47,3 +47,63 @@ class MetricType(str, Enum):
     ACTIVITY_BY_HOUR = "activity_by_hour"
     EVENT_TYPE_DISTRIBUTION = "event_type_distribution"
     DAILY_ACTIVITY_TREND = "daily_activity_trend"
+
+
+class MetricGranularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+
+
+class MetricAccuracy(str, Enum):
+    SKETCH = "sketch"
+    EXACT = "exact"
+    COMBINED = "combined"
+    HLL = "hll"
+    SAMPLED = "sampled"
+
+
+class ContentEncoding(str, Enum):
+    ZSTD = "zstd"
+    BROTLI = "br"
+    GZIP = "gzip"
+
+
+class EventProducerMode(str, Enum):
+    DIRECT = "direct"
+    BUFFERED = "buffered"
+
+
+class BufferOverflowPolicy(str, Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    REJECT = "reject"
+
+
+class KafkaProducerProfile(str, Enum):
+    LATENCY = "latency"
+    THROUGHPUT = "throughput"
+    DURABLE = "durable"
+
+
+class EventSerializationFormat(str, Enum):
+    JSON = "json"
+    ORJSON = "orjson"
+    MSGPACK = "msgpack"
+
+
+class MessageKeyField(str, Enum):
+    USER_ID = "user_id"
+    TRANSACTION_ID = "transaction_id"
+    NONE = "none"
+
+
+class KafkaPartitionerType(str, Enum):
+    MURMUR2 = "murmur2"
+    CRC32 = "crc32"
+    ROUND_ROBIN = "round_robin"
+
+
+class ClickHouseIngestMode(str, Enum):
+    KAFKA_ENGINE = "kafka_engine"
+    LOADER = "loader"
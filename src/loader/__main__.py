@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+
+from src.config import config
+from src.loader.bulk_loader import KafkaClickHouseBulkLoader
+from src.migrations.kafka_ingest import KAFKA_INGEST_TABLES
+from src.repositories.clickhouse_event_writer import ClickHouseEventWriter
+from src.repositories.clickhouse_pool import ClickHouseConnectionPool
+from src.services.event_serializers import create_event_serializer
+
+logger = logging.getLogger(__name__)
+
+
+async def run_loader() -> None:
+    pool = ClickHouseConnectionPool(
+        host=config.clickhouse_host,
+        port=config.clickhouse_port,
+        database=config.clickhouse_database,
+        user=config.clickhouse_user,
+        password=config.clickhouse_password,
+        min_size=config.clickhouse_pool_min_size,
+        max_size=config.clickhouse_pool_max_size,
+        acquire_timeout_seconds=config.clickhouse_pool_acquire_timeout_seconds,
+        max_idle_seconds=config.clickhouse_pool_max_idle_seconds,
+        health_check_interval_seconds=config.clickhouse_pool_health_check_interval_seconds,
+    )
+    loader = KafkaClickHouseBulkLoader(
+        bootstrap_servers=config.kafka_bootstrap_servers,
+        group_id=config.clickhouse_loader_group_id,
+        tables=KAFKA_INGEST_TABLES,
+        serializer=create_event_serializer(config.event_serialization_format),
+        writer=ClickHouseEventWriter(pool=pool, database=config.clickhouse_database),
+        batch_size=config.clickhouse_loader_batch_size,
+        flush_interval_seconds=config.clickhouse_loader_flush_interval_seconds,
+        max_poll_records=config.clickhouse_loader_max_poll_records,
+        partition_queue_size=config.clickhouse_loader_partition_queue_size,
+        max_insert_attempts=config.clickhouse_loader_max_insert_attempts,
+        dead_letter_enabled=config.clickhouse_kafka_engine_settings.dead_letter_enabled,
+    )
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, loader.request_stop)
+
+    await pool.open()
+    try:
+        await loader.run()
+    finally:
+        await pool.close()
+
+
+def _run_process() -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_loader())
+
+
+def main() -> None:
+    if config.clickhouse_loader_processes <= 1:
+        _run_process()
+        return
+
+    processes = [
+        multiprocessing.Process(target=_run_process, name=f"clickhouse-loader-{index}")
+        for index in range(config.clickhouse_loader_processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def _terminate(signum: int, frame: object) -> None:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGINT, _terminate)
+    signal.signal(signal.SIGTERM, _terminate)
+    logger.info(f"Started {len(processes)} loader processes")
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
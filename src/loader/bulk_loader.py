@@ -0,0 +1,291 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import Callable
+
+from aiokafka import AIOKafkaConsumer, ConsumerRebalanceListener, ConsumerRecord, TopicPartition
+from aiokafka.errors import CommitFailedError, KafkaError
+
+from src.enums import KafkaTopic
+from src.loader.columnar_batch import ColumnarBatch, parse_event_timestamp
+from src.migrations.kafka_ingest import DEAD_LETTER_TABLE, KafkaIngestTable
+from src.repositories.clickhouse_event_writer import ClickHouseEventWriter
+from src.services.event_serializers import EventSerializerInterface
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_BACKOFF_SECONDS = 30.0
+DEAD_LETTER_COLUMNS = ("topic", "partition", "offset", "raw_message", "error")
+
+
+class PartitionLoadError(Exception):
+    pass
+
+
+class PartitionLoader:
+    def __init__(
+        self,
+        topic_partition: TopicPartition,
+        table: KafkaIngestTable,
+        consumer: AIOKafkaConsumer,
+        serializer: EventSerializerInterface,
+        writer: ClickHouseEventWriter,
+        batch_size: int,
+        flush_interval_seconds: float,
+        queue_size: int,
+        retry_backoff_seconds: float,
+        max_insert_attempts: int,
+        dead_letter_enabled: bool,
+        on_failure: Callable[[TopicPartition, Exception], None],
+    ):
+        self._topic_partition = topic_partition
+        self._table = table
+        self._column_names = (*(name for name, _ in table.columns), "timestamp")
+        self._consumer = consumer
+        self._serializer = serializer
+        self._writer = writer
+        self._batch_size = batch_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._max_insert_attempts = max_insert_attempts
+        self._dead_letter_enabled = dead_letter_enabled
+        self._on_failure = on_failure
+        self._queue: asyncio.Queue[list[ConsumerRecord] | None] = asyncio.Queue(maxsize=queue_size)
+        self._stop_requested = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, records: list[ConsumerRecord]) -> None:
+        await self._queue.put(records)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop_requested.set()
+        with contextlib.suppress(asyncio.QueueFull):
+            self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        try:
+            await self._consume()
+        except Exception as e:
+            logger.error(f"Loader for {self._topic_partition} failed: {e}")
+            self._on_failure(self._topic_partition, e)
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+    async def _consume(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping and not self._stop_requested.is_set():
+            records = await self._queue.get()
+            if records is None:
+                return
+
+            batch = ColumnarBatch(self._column_names)
+            self._append(batch, records)
+            deadline = loop.time() + self._flush_interval_seconds
+            while len(batch) < self._batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    records = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except TimeoutError:
+                    break
+                if records is None:
+                    stopping = True
+                    break
+                self._append(batch, records)
+
+            await self._flush(batch)
+
+    def _append(self, batch: ColumnarBatch, records: list[ConsumerRecord]) -> None:
+        topic = KafkaTopic(self._topic_partition.topic)
+        for record in records:
+            try:
+                row = self._serializer.deserialize(topic, record.value)
+                row["timestamp"] = parse_event_timestamp(row["timestamp"])
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping undecodable message {self._topic_partition}@{record.offset}: {e}")
+                batch.skip(record.offset)
+                continue
+            batch.append(record.offset, row, record.value)
+
+    async def _flush(self, batch: ColumnarBatch) -> None:
+        if batch.last_offset is None:
+            return
+
+        if len(batch):
+            deduplication_token = (
+                f"{self._topic_partition.topic}:{self._topic_partition.partition}:"
+                f"{batch.first_offset}:{batch.last_offset}"
+            )
+            error = await self._insert(batch, deduplication_token)
+            if error is not None:
+                if self._stop_requested.is_set():
+                    logger.warning(f"Leaving {len(batch)} rows from {self._topic_partition} uncommitted: {error}")
+                    return
+                if not self._dead_letter_enabled:
+                    raise PartitionLoadError(
+                        f"Insert into {self._table.storage_table} failed {self._max_insert_attempts} times: {error}"
+                    ) from error
+                await self._dead_letter(batch, error)
+
+        try:
+            await self._consumer.commit({self._topic_partition: batch.last_offset + 1})
+        except (CommitFailedError, KafkaError) as e:
+            logger.warning(f"Failed to commit offset {batch.last_offset + 1} for {self._topic_partition}: {e}")
+            return
+        logger.debug(f"Loaded {len(batch)} rows from {self._topic_partition} up to offset {batch.last_offset}")
+
+    async def _insert(self, batch: ColumnarBatch, deduplication_token: str) -> Exception | None:
+        backoff = self._retry_backoff_seconds
+        for attempt in range(1, self._max_insert_attempts + 1):
+            try:
+                await self._writer.insert_columns(
+                    self._table.storage_table, self._column_names, batch.columns(), deduplication_token
+                )
+                return None
+            except Exception as e:
+                error = e
+            if attempt == self._max_insert_attempts:
+                break
+            logger.error(
+                f"Insert into {self._table.storage_table} failed (attempt {attempt}/{self._max_insert_attempts}), "
+                f"retrying in {backoff:.1f}s: {error}"
+            )
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stop_requested.wait(), timeout=backoff)
+            if self._stop_requested.is_set():
+                break
+            backoff = min(backoff * 2, MAX_RETRY_BACKOFF_SECONDS)
+        return error
+
+    async def _dead_letter(self, batch: ColumnarBatch, error: Exception) -> None:
+        logger.error(
+            f"Moving {len(batch)} rows from {self._topic_partition} at offsets "
+            f"{batch.first_offset}-{batch.last_offset} to {DEAD_LETTER_TABLE}: {error}"
+        )
+        columns: list[list[object]] = [[], [], [], [], []]
+        for offset, raw_message in batch.raw_messages:
+            columns[0].append(self._topic_partition.topic)
+            columns[1].append(self._topic_partition.partition)
+            columns[2].append(offset)
+            columns[3].append(raw_message.decode("utf-8", errors="backslashreplace"))
+            columns[4].append(str(error))
+        await self._writer.insert_columns(DEAD_LETTER_TABLE, DEAD_LETTER_COLUMNS, columns)
+
+
+class _PartitionRebalanceListener(ConsumerRebalanceListener):
+    def __init__(self, loader: "KafkaClickHouseBulkLoader"):
+        self._loader = loader
+
+    async def on_partitions_revoked(self, revoked: set[TopicPartition]) -> None:
+        await self._loader.stop_partitions(revoked)
+
+    async def on_partitions_assigned(self, assigned: set[TopicPartition]) -> None:
+        self._loader.start_partitions(assigned)
+
+
+class KafkaClickHouseBulkLoader:
+    def __init__(
+        self,
+        bootstrap_servers: str,
+        group_id: str,
+        tables: tuple[KafkaIngestTable, ...],
+        serializer: EventSerializerInterface,
+        writer: ClickHouseEventWriter,
+        batch_size: int,
+        flush_interval_seconds: float,
+        max_poll_records: int,
+        partition_queue_size: int,
+        max_insert_attempts: int,
+        dead_letter_enabled: bool,
+        retry_backoff_seconds: float = 1.0,
+    ):
+        self._bootstrap_servers = bootstrap_servers
+        self._group_id = group_id
+        self._tables = {table.topic.value: table for table in tables}
+        self._serializer = serializer
+        self._writer = writer
+        self._batch_size = batch_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_poll_records = max_poll_records
+        self._partition_queue_size = partition_queue_size
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._max_insert_attempts = max_insert_attempts
+        self._dead_letter_enabled = dead_letter_enabled
+        self._consumer: AIOKafkaConsumer | None = None
+        self._partitions: dict[TopicPartition, PartitionLoader] = {}
+        self._stopping = asyncio.Event()
+        self._failure: PartitionLoadError | None = None
+
+    async def run(self) -> None:
+        self._consumer = AIOKafkaConsumer(
+            bootstrap_servers=self._bootstrap_servers,
+            group_id=self._group_id,
+            enable_auto_commit=False,
+            auto_offset_reset="earliest",
+            max_poll_records=self._max_poll_records,
+        )
+        self._consumer.subscribe(topics=list(self._tables), listener=_PartitionRebalanceListener(self))
+        await self._consumer.start()
+        logger.info(f"Bulk loader consuming {list(self._tables)} as group {self._group_id}")
+
+        try:
+            while not self._stopping.is_set():
+                fetched = await self._consumer.getmany(timeout_ms=1000, max_records=self._max_poll_records)
+                for topic_partition, records in fetched.items():
+                    partition_loader = self._partitions.get(topic_partition)
+                    if partition_loader is not None and records:
+                        await partition_loader.put(records)
+        finally:
+            await self.stop_partitions(set(self._partitions))
+            await self._consumer.stop()
+            self._consumer = None
+
+        if self._failure is not None:
+            raise self._failure
+
+    def request_stop(self) -> None:
+        self._stopping.set()
+
+    def start_partitions(self, topic_partitions: set[TopicPartition]) -> None:
+        for topic_partition in topic_partitions:
+            if topic_partition in self._partitions:
+                continue
+            partition_loader = PartitionLoader(
+                topic_partition=topic_partition,
+                table=self._tables[topic_partition.topic],
+                consumer=self._consumer,
+                serializer=self._serializer,
+                writer=self._writer,
+                batch_size=self._batch_size,
+                flush_interval_seconds=self._flush_interval_seconds,
+                queue_size=self._partition_queue_size,
+                retry_backoff_seconds=self._retry_backoff_seconds,
+                max_insert_attempts=self._max_insert_attempts,
+                dead_letter_enabled=self._dead_letter_enabled,
+                on_failure=self._on_partition_failure,
+            )
+            partition_loader.start()
+            self._partitions[topic_partition] = partition_loader
+        logger.info(f"Loading partitions: {sorted(str(tp) for tp in self._partitions)}")
+
+    async def stop_partitions(self, topic_partitions: set[TopicPartition]) -> None:
+        partition_loaders = [
+            self._partitions.pop(topic_partition)
+            for topic_partition in topic_partitions
+            if topic_partition in self._partitions
+        ]
+        await asyncio.gather(*(partition_loader.stop() for partition_loader in partition_loaders))
+
+    def _on_partition_failure(self, topic_partition: TopicPartition, error: Exception) -> None:
+        if self._failure is None:
+            self._failure = PartitionLoadError(f"Stopping bulk loader, partition {topic_partition} failed: {error}")
+        self.request_stop()
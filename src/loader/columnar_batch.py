@@ -0,0 +1,42 @@
+from datetime import UTC, datetime, timedelta
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def parse_event_timestamp(value: object) -> datetime:
+    match value:
+        case int():
+            return EPOCH + timedelta(milliseconds=value)
+        case str() if value.isdigit():
+            return EPOCH + timedelta(milliseconds=int(value))
+        case str():
+            parsed = datetime.fromisoformat(value)
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+        case _:
+            raise ValueError(f"Unsupported timestamp value: {value!r}")
+
+
+class ColumnarBatch:
+    def __init__(self, column_names: tuple[str, ...]):
+        self.column_names = column_names
+        self._columns: list[list[object]] = [[] for _ in column_names]
+        self.raw_messages: list[tuple[int, bytes]] = []
+        self.first_offset: int | None = None
+        self.last_offset: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._columns[0])
+
+    def append(self, offset: int, row: dict[str, object], raw_message: bytes) -> None:
+        for column, name in zip(self._columns, self.column_names):
+            column.append(row.get(name))
+        self.raw_messages.append((offset, raw_message))
+        self.skip(offset)
+
+    def skip(self, offset: int) -> None:
+        if self.first_offset is None:
+            self.first_offset = offset
+        self.last_offset = offset
+
+    def columns(self) -> list[list[object]]:
+        return self._columns
@@ -1,47 +1,70 @@
+import logging
+import os
 from contextlib import asynccontextmanager
 
-import asynch
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from src.config import config
 from src.di import Container
+from src.endpoints.compression import CompressionMiddleware
 from src.endpoints.dashboard import router as dashboard_router
 from src.endpoints.events import router as events_router
+from src.endpoints.stats import router as stats_router
+from src.services.buffered_producer import EventBufferFullError
 from src.services.kafka_admin import KafkaAdminService
 
+logger = logging.getLogger(__name__)
+
 container = Container()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    kafka_admin = KafkaAdminService(
-        kafka_brokers=config.kafka_brokers,
-        kafka_topic_partitions=config.kafka_topic_partitions,
-        kafka_replication_factor=config.kafka_replication_factor,
-    )
-    await kafka_admin.ensure_topics_exist()
-
-    clickhouse_connection = await asynch.connect(
-        host=config.clickhouse_host,
-        port=config.clickhouse_port,
-        database=config.clickhouse_database,
-        user=config.clickhouse_user,
-        password=config.clickhouse_password,
-    )
-
-    container.clickhouse_connection.override(clickhouse_connection)
-
-    kafka_producer = container.kafka_producer()
-    await kafka_producer.start()
+    leader_lock = container.leader_lock()
+    kafka_admin: KafkaAdminService | None = None
+    if not leader_lock.try_acquire():
+        logger.info(f"Worker {os.getpid()} is waiting for the leader to create Kafka topics")
+        await leader_lock.wait_for_leader()
+    if leader_lock.is_leader:
+        logger.info(f"Worker {os.getpid()} is the leader, ensuring Kafka topics exist")
+        kafka_admin = KafkaAdminService(
+            kafka_brokers=config.kafka_brokers,
+            kafka_topic_partitions=config.kafka_topic_partitions,
+            kafka_replication_factor=config.kafka_replication_factor,
+        )
+        await kafka_admin.ensure_topics_exist()
+        leader_lock.mark_ready()
+
+    clickhouse_pool = container.clickhouse_pool()
+    await clickhouse_pool.open()
+
+    event_producer = container.event_producer()
+    await event_producer.start()
     yield
-    await kafka_producer.stop()
-    await clickhouse_connection.close()
-    kafka_admin.close()
+    await container.dashboard_broadcaster().stop()
+    await event_producer.stop()
+    await container.kafka_consumer_lag_service().stop()
+    await clickhouse_pool.close()
+    if kafka_admin is not None:
+        kafka_admin.close()
+    leader_lock.release()
 
 
 app = FastAPI(lifespan=lifespan)
 
+
+@app.exception_handler(EventBufferFullError)
+async def event_buffer_full_handler(request: Request, exc: EventBufferFullError) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+app.add_middleware(
+    CompressionMiddleware,
+    encodings=config.response_compression_encodings,
+    minimum_size=config.response_compression_min_size,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -50,7 +73,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-container.wire(modules=["src.endpoints.events", "src.endpoints.dashboard"])
+container.wire(modules=["src.endpoints.events", "src.endpoints.dashboard", "src.endpoints.stats"])
 
 app.include_router(events_router)
 app.include_router(dashboard_router)
+app.include_router(stats_router)
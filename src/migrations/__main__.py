@@ -0,0 +1,49 @@
+import asyncio
+import logging
+from pathlib import Path
+
+import asynch
+
+from src.config import config
+from src.migrations.kafka_ingest import KafkaIngestSchema
+from src.migrations.runner import ClickHouseMigrationRunner
+
+MIGRATIONS_DIR = Path(__file__).parent / "versions"
+
+
+async def main() -> None:
+    connection = await asynch.connect(
+        host=config.clickhouse_host,
+        port=config.clickhouse_port,
+        database=config.clickhouse_database,
+        user=config.clickhouse_user,
+        password=config.clickhouse_password,
+    )
+    try:
+        runner = ClickHouseMigrationRunner(
+            connection=connection,
+            database=config.clickhouse_database,
+            migrations_dir=MIGRATIONS_DIR,
+            variables={
+                "database": config.clickhouse_database,
+                "raw_events_ttl_days": str(config.clickhouse_raw_events_ttl_days),
+            },
+        )
+        await runner.run()
+
+        kafka_ingest = KafkaIngestSchema(
+            database=config.clickhouse_database,
+            broker_list=config.kafka_bootstrap_servers,
+            serialization_format=config.event_serialization_format,
+            timestamp_compat=config.clickhouse_kafka_timestamp_compat,
+            engine_settings=config.clickhouse_kafka_engine_settings,
+            ingest_mode=config.clickhouse_ingest_mode,
+        )
+        await kafka_ingest.apply(connection)
+    finally:
+        await connection.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,204 @@
+import logging
+from dataclasses import dataclass
+
+from asynch.connection import Connection
+
+from src.config import ClickHouseKafkaEngineSettings
+from src.enums import ClickHouseIngestMode, EventSerializationFormat, KafkaTopic
+
+logger = logging.getLogger(__name__)
+
+KAFKA_ENGINE_FORMATS: dict[EventSerializationFormat, str] = {
+    EventSerializationFormat.JSON: "JSONEachRow",
+    EventSerializationFormat.ORJSON: "JSONEachRow",
+    EventSerializationFormat.MSGPACK: "MsgPack",
+}
+
+EPOCH_MS_TIMESTAMP_EXPRESSION = "fromUnixTimestamp64Milli(timestamp)"
+COMPAT_TIMESTAMP_EXPRESSION = (
+    "if(match(timestamp, '^[0-9]+$'), "
+    "fromUnixTimestamp64Milli(toInt64(timestamp)), "
+    "parseDateTime64BestEffort(timestamp, 3))"
+)
+
+
+@dataclass(frozen=True)
+class KafkaIngestTable:
+    topic: KafkaTopic
+    kafka_table: str
+    consumer_view: str
+    storage_table: str
+    consumer_group: str
+    columns: tuple[tuple[str, str], ...]
+
+
+DEAD_LETTER_TABLE = "kafka_dead_letters"
+DEAD_LETTER_TTL_DAYS = 14
+
+KAFKA_INGEST_TABLES: tuple[KafkaIngestTable, ...] = (
+    KafkaIngestTable(
+        topic=KafkaTopic.USER_EVENTS,
+        kafka_table="user_events",
+        consumer_view="user_events_consumer",
+        storage_table="user_events_storage",
+        consumer_group="clickhouse_user_consumer",
+        columns=(("event_type", "String"), ("user_id", "String")),
+    ),
+    KafkaIngestTable(
+        topic=KafkaTopic.TRANSACTION_EVENTS,
+        kafka_table="transaction_events",
+        consumer_view="transaction_events_consumer",
+        storage_table="transaction_events_storage",
+        consumer_group="clickhouse_transaction_consumer",
+        columns=(
+            ("event_type", "String"),
+            ("user_id", "String"),
+            ("transaction_id", "String"),
+            ("amount", "Decimal64(2)"),
+            ("currency", "String"),
+        ),
+    ),
+    KafkaIngestTable(
+        topic=KafkaTopic.INTERACTION_EVENTS,
+        kafka_table="interaction_events",
+        consumer_view="interaction_events_consumer",
+        storage_table="interaction_events_storage",
+        consumer_group="clickhouse_interaction_consumer",
+        columns=(
+            ("event_type", "String"),
+            ("user_id", "String"),
+            ("element_name", "Nullable(String)"),
+            ("page", "Nullable(String)"),
+            ("query", "Nullable(String)"),
+            ("form_name", "Nullable(String)"),
+            ("item_id", "Nullable(String)"),
+            ("filter_name", "Nullable(String)"),
+            ("filter_value", "Nullable(String)"),
+        ),
+    ),
+)
+
+
+class KafkaIngestSchema:
+    def __init__(
+        self,
+        database: str,
+        broker_list: str,
+        serialization_format: EventSerializationFormat,
+        timestamp_compat: bool,
+        engine_settings: ClickHouseKafkaEngineSettings,
+        ingest_mode: ClickHouseIngestMode,
+        tables: tuple[KafkaIngestTable, ...] = KAFKA_INGEST_TABLES,
+    ):
+        if timestamp_compat and serialization_format == EventSerializationFormat.MSGPACK:
+            raise ValueError("Timestamp compatibility mode is only supported for JSON serialization formats")
+
+        self._database = database
+        self._broker_list = broker_list
+        self._kafka_format = KAFKA_ENGINE_FORMATS[serialization_format]
+        self._timestamp_compat = timestamp_compat
+        self._engine_settings = engine_settings
+        self._ingest_mode = ingest_mode
+        self._tables = tables
+
+    def statements(self) -> list[str]:
+        statements: list[str] = []
+        consume = self._ingest_mode == ClickHouseIngestMode.KAFKA_ENGINE
+        if self._engine_settings.dead_letter_enabled:
+            statements.append(self._dead_letter_table_sql())
+        for table in self._tables:
+            statements.append(f"DROP VIEW IF EXISTS {self._database}.{table.consumer_view}")
+            statements.append(f"DROP VIEW IF EXISTS {self._database}.{self._dead_letter_view(table)}")
+            statements.append(f"DROP TABLE IF EXISTS {self._database}.{table.kafka_table}")
+            if not consume:
+                continue
+            statements.append(self._kafka_table_sql(table))
+            statements.append(self._consumer_view_sql(table))
+            if self._engine_settings.dead_letter_enabled:
+                statements.append(self._dead_letter_view_sql(table))
+        return statements
+
+    async def apply(self, connection: Connection) -> None:
+        if self._ingest_mode != ClickHouseIngestMode.KAFKA_ENGINE:
+            logger.info(f"Dropping Kafka ingest tables, storage is fed by the {self._ingest_mode.value} ingest path")
+            await self._execute(connection)
+            return
+
+        mode = "compat" if self._timestamp_compat else "epoch_ms"
+        logger.info(
+            f"Recreating Kafka ingest tables with format {self._kafka_format}, {mode} timestamps and "
+            f"{self._engine_settings.num_consumers} consumers per topic"
+        )
+        await self._execute(connection)
+
+    async def _execute(self, connection: Connection) -> None:
+        for statement in self.statements():
+            async with connection.cursor() as cursor:
+                await cursor.execute(statement)
+                await cursor.fetchall()
+
+    def _kafka_table_sql(self, table: KafkaIngestTable) -> str:
+        timestamp_type = "String" if self._timestamp_compat else "Int64"
+        columns = ",\n    ".join(
+            f"{name} {column_type}" for name, column_type in (*table.columns, ("timestamp", timestamp_type))
+        )
+        settings = {
+            "kafka_broker_list": f"'{self._broker_list}'",
+            "kafka_topic_list": f"'{table.topic.value}'",
+            "kafka_group_name": f"'{table.consumer_group}'",
+            "kafka_format": f"'{self._kafka_format}'",
+            "kafka_num_consumers": str(self._engine_settings.num_consumers),
+            "kafka_max_block_size": str(self._engine_settings.max_block_size),
+            "kafka_flush_interval_ms": str(self._engine_settings.flush_interval_ms),
+            "kafka_thread_per_consumer": "1" if self._engine_settings.thread_per_consumer else "0",
+            "kafka_skip_broken_messages": str(self._engine_settings.skip_broken_messages),
+        }
+        if self._engine_settings.dead_letter_enabled:
+            settings["kafka_handle_error_mode"] = "'stream'"
+        if self._timestamp_compat:
+            settings["input_format_json_read_numbers_as_strings"] = "1"
+        settings_sql = ",\n    ".join(f"{name} = {value}" for name, value in settings.items())
+        return (
+            f"CREATE TABLE {self._database}.{table.kafka_table} (\n    {columns}\n) ENGINE = Kafka\n"
+            f"SETTINGS\n    {settings_sql}"
+        )
+
+    def _consumer_view_sql(self, table: KafkaIngestTable) -> str:
+        timestamp_expression = COMPAT_TIMESTAMP_EXPRESSION if self._timestamp_compat else EPOCH_MS_TIMESTAMP_EXPRESSION
+        columns = ", ".join(name for name, _ in table.columns)
+        sql = (
+            f"CREATE MATERIALIZED VIEW {self._database}.{table.consumer_view} "
+            f"TO {self._database}.{table.storage_table} AS\n"
+            f"SELECT {columns}, {timestamp_expression} AS timestamp FROM {self._database}.{table.kafka_table}"
+        )
+        if self._engine_settings.dead_letter_enabled:
+            sql += "\nWHERE length(_error) = 0"
+        return sql
+
+    def _dead_letter_table_sql(self) -> str:
+        return (
+            f"CREATE TABLE IF NOT EXISTS {self._database}.{DEAD_LETTER_TABLE} (\n"
+            "    topic LowCardinality(String),\n"
+            "    partition UInt64,\n"
+            "    offset UInt64,\n"
+            "    raw_message String CODEC(ZSTD(3)),\n"
+            "    error String,\n"
+            "    received_at DateTime DEFAULT now()\n"
+            ") ENGINE = MergeTree()\n"
+            "PARTITION BY toYYYYMMDD(received_at)\n"
+            "ORDER BY (topic, received_at)\n"
+            f"TTL received_at + INTERVAL {DEAD_LETTER_TTL_DAYS} DAY"
+        )
+
+    def _dead_letter_view(self, table: KafkaIngestTable) -> str:
+        return f"{table.kafka_table}_dead_letters"
+
+    def _dead_letter_view_sql(self, table: KafkaIngestTable) -> str:
+        return (
+            f"CREATE MATERIALIZED VIEW {self._database}.{self._dead_letter_view(table)} "
+            f"TO {self._database}.{DEAD_LETTER_TABLE} AS\n"
+            "SELECT _topic AS topic, _partition AS partition, _offset AS offset, "
+            "_raw_message AS raw_message, _error AS error\n"
+            f"FROM {self._database}.{table.kafka_table}\n"
+            "WHERE length(_error) > 0"
+        )
@@ -0,0 +1,103 @@
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+
+from asynch.connection import Connection
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+STATEMENT_SEPARATOR = re.compile(r";\s*(?:\n|$)")
+STATEMENT_GUARD = re.compile(r"^--\s*unless:\s*(.+)$")
+
+
+@dataclass(frozen=True)
+class MigrationStatement:
+    sql: str
+    unless: str | None = None
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    statements: tuple[MigrationStatement, ...]
+
+
+class ClickHouseMigrationRunner:
+    def __init__(self, connection: Connection, database: str, migrations_dir: Path, variables: dict[str, str]):
+        self._connection = connection
+        self._database = database
+        self._migrations_dir = migrations_dir
+        self._variables = variables
+
+    async def run(self) -> list[Migration]:
+        await self._execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self._database}.schema_migrations (
+                version UInt32,
+                name String,
+                applied_at DateTime DEFAULT now()
+            ) ENGINE = MergeTree()
+            ORDER BY version
+            """
+        )
+        applied_versions = {
+            row[0] for row in await self._execute(f"SELECT version FROM {self._database}.schema_migrations")
+        }
+
+        applied: list[Migration] = []
+        for migration in self.load_migrations():
+            if migration.version in applied_versions:
+                continue
+            logger.info(f"Applying migration {migration.version:04d}_{migration.name}")
+            for statement in migration.statements:
+                if statement.unless is not None and await self._holds(statement.unless):
+                    logger.info(f"Skipping statement of migration {migration.version:04d}, {statement.unless} holds")
+                    continue
+                await self._execute(statement.sql)
+            await self._execute(
+                f"INSERT INTO {self._database}.schema_migrations (version, name) VALUES",
+                [(migration.version, migration.name)],
+            )
+            applied.append(migration)
+
+        logger.info(f"Applied {len(applied)} migrations")
+        return applied
+
+    def load_migrations(self) -> list[Migration]:
+        migrations: list[Migration] = []
+        for path in sorted(self._migrations_dir.glob("*.sql")):
+            match = MIGRATION_FILE_PATTERN.match(path.name)
+            if match is None:
+                raise ValueError(f"Invalid migration file name: {path.name}")
+            sql = Template(path.read_text()).substitute(self._variables)
+            statements = tuple(
+                self._parse_statement(statement.strip())
+                for statement in STATEMENT_SEPARATOR.split(sql)
+                if statement.strip()
+            )
+            migrations.append(Migration(version=int(match.group(1)), name=match.group(2), statements=statements))
+
+        versions = [migration.version for migration in migrations]
+        if len(versions) != len(set(versions)):
+            raise ValueError(f"Duplicate migration versions in {self._migrations_dir}")
+        return migrations
+
+    def _parse_statement(self, statement: str) -> MigrationStatement:
+        first_line, _, rest = statement.partition("\n")
+        guard = STATEMENT_GUARD.match(first_line)
+        if guard is None:
+            return MigrationStatement(sql=statement)
+        return MigrationStatement(sql=rest.strip(), unless=guard.group(1).strip())
+
+    async def _holds(self, condition: str) -> bool:
+        rows = await self._execute(condition)
+        return bool(rows and rows[0][0])
+
+    async def _execute(self, query: str, params: list[tuple] | None = None) -> list[tuple]:
+        async with self._connection.cursor() as cursor:
+            await cursor.execute(query, params)
+            return await cursor.fetchall()
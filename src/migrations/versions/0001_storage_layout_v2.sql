@@ -0,0 +1,144 @@
+DROP VIEW IF EXISTS ${database}.user_events_consumer;
+DROP VIEW IF EXISTS ${database}.transaction_events_consumer;
+DROP VIEW IF EXISTS ${database}.interaction_events_consumer;
+DROP VIEW IF EXISTS ${database}.user_events_hourly_mv;
+DROP VIEW IF EXISTS ${database}.transaction_events_hourly_mv;
+DROP VIEW IF EXISTS ${database}.interaction_events_hourly_mv;
+DROP VIEW IF EXISTS ${database}.interaction_dimensions_hourly_mv;
+
+-- unless: EXISTS TABLE ${database}.user_events_storage_v1_backup
+DROP TABLE IF EXISTS ${database}.user_events_storage_v2;
+
+-- unless: EXISTS TABLE ${database}.user_events_storage_v1_backup
+CREATE TABLE ${database}.user_events_storage_v2 (
+    event_type LowCardinality(String),
+    user_id String CODEC(ZSTD(1)),
+    timestamp DateTime64(3) CODEC(DoubleDelta, ZSTD(1)),
+    INDEX idx_user_id user_id TYPE bloom_filter(0.01) GRANULARITY 4
+) ENGINE = MergeTree()
+PARTITION BY toYYYYMM(timestamp)
+ORDER BY (event_type, timestamp, user_id)
+TTL toDateTime(timestamp) + INTERVAL ${raw_events_ttl_days} DAY;
+
+-- unless: EXISTS TABLE ${database}.user_events_storage_v1_backup
+INSERT INTO ${database}.user_events_storage_v2 (event_type, user_id, timestamp)
+SELECT event_type, user_id, timestamp FROM ${database}.user_events_storage;
+
+-- unless: EXISTS TABLE ${database}.user_events_storage_v1_backup
+EXCHANGE TABLES ${database}.user_events_storage AND ${database}.user_events_storage_v2;
+
+-- unless: EXISTS TABLE ${database}.user_events_storage_v1_backup
+RENAME TABLE ${database}.user_events_storage_v2 TO ${database}.user_events_storage_v1_backup;
+
+-- unless: EXISTS TABLE ${database}.transaction_events_storage_v1_backup
+DROP TABLE IF EXISTS ${database}.transaction_events_storage_v2;
+
+-- unless: EXISTS TABLE ${database}.transaction_events_storage_v1_backup
+CREATE TABLE ${database}.transaction_events_storage_v2 (
+    event_type LowCardinality(String),
+    user_id String CODEC(ZSTD(1)),
+    transaction_id String CODEC(ZSTD(1)),
+    amount Decimal64(2) CODEC(ZSTD(1)),
+    currency LowCardinality(String),
+    timestamp DateTime64(3) CODEC(DoubleDelta, ZSTD(1)),
+    INDEX idx_user_id user_id TYPE bloom_filter(0.01) GRANULARITY 4
+) ENGINE = MergeTree()
+PARTITION BY toYYYYMM(timestamp)
+ORDER BY (timestamp, user_id)
+TTL toDateTime(timestamp) + INTERVAL ${raw_events_ttl_days} DAY;
+
+-- unless: EXISTS TABLE ${database}.transaction_events_storage_v1_backup
+INSERT INTO ${database}.transaction_events_storage_v2 (event_type, user_id, transaction_id, amount, currency, timestamp)
+SELECT event_type, user_id, transaction_id, amount, currency, timestamp FROM ${database}.transaction_events_storage;
+
+-- unless: EXISTS TABLE ${database}.transaction_events_storage_v1_backup
+EXCHANGE TABLES ${database}.transaction_events_storage AND ${database}.transaction_events_storage_v2;
+
+-- unless: EXISTS TABLE ${database}.transaction_events_storage_v1_backup
+RENAME TABLE ${database}.transaction_events_storage_v2 TO ${database}.transaction_events_storage_v1_backup;
+
+-- unless: EXISTS TABLE ${database}.interaction_events_storage_v1_backup
+DROP TABLE IF EXISTS ${database}.interaction_events_storage_v2;
+
+-- unless: EXISTS TABLE ${database}.interaction_events_storage_v1_backup
+CREATE TABLE ${database}.interaction_events_storage_v2 (
+    event_type LowCardinality(String),
+    user_id String CODEC(ZSTD(1)),
+    element_name LowCardinality(Nullable(String)),
+    page LowCardinality(Nullable(String)),
+    query Nullable(String) CODEC(ZSTD(1)),
+    form_name LowCardinality(Nullable(String)),
+    item_id Nullable(String) CODEC(ZSTD(1)),
+    filter_name LowCardinality(Nullable(String)),
+    filter_value LowCardinality(Nullable(String)),
+    timestamp DateTime64(3) CODEC(DoubleDelta, ZSTD(1)),
+    INDEX idx_user_id user_id TYPE bloom_filter(0.01) GRANULARITY 4,
+    INDEX idx_item_id item_id TYPE bloom_filter(0.01) GRANULARITY 4,
+    INDEX idx_query query TYPE bloom_filter(0.01) GRANULARITY 4
+) ENGINE = MergeTree()
+PARTITION BY toYYYYMMDD(timestamp)
+ORDER BY (event_type, timestamp, user_id)
+TTL toDateTime(timestamp) + INTERVAL ${raw_events_ttl_days} DAY;
+
+-- unless: EXISTS TABLE ${database}.interaction_events_storage_v1_backup
+INSERT INTO ${database}.interaction_events_storage_v2 (
+    event_type, user_id, element_name, page, query, form_name, item_id, filter_name, filter_value, timestamp
+)
+SELECT event_type, user_id, element_name, page, query, form_name, item_id, filter_name, filter_value, timestamp
+FROM ${database}.interaction_events_storage;
+
+-- unless: EXISTS TABLE ${database}.interaction_events_storage_v1_backup
+EXCHANGE TABLES ${database}.interaction_events_storage AND ${database}.interaction_events_storage_v2;
+
+-- unless: EXISTS TABLE ${database}.interaction_events_storage_v1_backup
+RENAME TABLE ${database}.interaction_events_storage_v2 TO ${database}.interaction_events_storage_v1_backup;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS ${database}.user_events_hourly_mv TO ${database}.user_events_hourly AS
+SELECT toStartOfHour(timestamp) AS hour, event_type, count() AS events, uniqState(user_id) AS users
+FROM ${database}.user_events_storage
+GROUP BY hour, event_type;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS ${database}.transaction_events_hourly_mv TO ${database}.transaction_events_hourly AS
+SELECT toStartOfHour(timestamp) AS hour, currency, count() AS transactions, sum(amount) AS revenue, uniqState(user_id) AS users
+FROM ${database}.transaction_events_storage
+GROUP BY hour, currency;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS ${database}.interaction_events_hourly_mv TO ${database}.interaction_events_hourly AS
+SELECT toStartOfHour(timestamp) AS hour, event_type, count() AS events, uniqState(user_id) AS users
+FROM ${database}.interaction_events_storage
+GROUP BY hour, event_type;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS ${database}.interaction_dimensions_hourly_mv TO ${database}.interaction_dimensions_hourly AS
+SELECT
+    toStartOfHour(timestamp) AS hour,
+    event_type,
+    assumeNotNull(multiIf(
+        event_type = 'page_view', page,
+        event_type = 'search', query,
+        event_type = 'element_click', element_name,
+        event_type = 'filter_applied', filter_name,
+        item_id
+    )) AS dimension_key,
+    if(event_type = 'filter_applied', ifNull(filter_value, ''), '') AS dimension_value,
+    count() AS events,
+    uniqState(user_id) AS users
+FROM ${database}.interaction_events_storage
+WHERE event_type IN ('page_view', 'search', 'element_click', 'filter_applied', 'item_added_to_cart')
+    AND multiIf(
+        event_type = 'page_view', page,
+        event_type = 'search', query,
+        event_type = 'element_click', element_name,
+        event_type = 'filter_applied', filter_name,
+        item_id
+    ) IS NOT NULL
+GROUP BY hour, event_type, dimension_key, dimension_value;
+
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS ${database}.user_events_consumer TO ${database}.user_events_storage AS
+SELECT event_type, user_id, parseDateTimeBestEffort(timestamp) as timestamp FROM ${database}.user_events;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS ${database}.transaction_events_consumer TO ${database}.transaction_events_storage AS
+SELECT event_type, user_id, transaction_id, amount, currency, parseDateTimeBestEffort(timestamp) as timestamp FROM ${database}.transaction_events;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS ${database}.interaction_events_consumer TO ${database}.interaction_events_storage AS
+SELECT event_type, user_id, element_name, page, query, form_name, item_id, filter_name, filter_value, parseDateTimeBestEffort(timestamp) as timestamp FROM ${database}.interaction_events;
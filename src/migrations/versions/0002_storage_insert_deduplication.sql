@@ -0,0 +1,3 @@
+ALTER TABLE ${database}.user_events_storage MODIFY SETTING non_replicated_deduplication_window = 1000;
+ALTER TABLE ${database}.transaction_events_storage MODIFY SETTING non_replicated_deduplication_window = 1000;
+ALTER TABLE ${database}.interaction_events_storage MODIFY SETTING non_replicated_deduplication_window = 1000;
@@ -0,0 +1,3 @@
+DROP VIEW IF EXISTS ${database}.user_events_consumer;
+DROP VIEW IF EXISTS ${database}.transaction_events_consumer;
+DROP VIEW IF EXISTS ${database}.interaction_events_consumer;
@@ -0,0 +1,77 @@
+import logging
+import time
+
+from src.dto.dashboard.metric_data import MetricData, TimeSeriesData
+from src.dto.dashboard.time_range import MetricTimeRange
+from src.enums import MetricAccuracy, MetricType
+from src.repositories.clickhouse_repository import ClickHouseRepositoryInterface
+from src.repositories.metric_cache import MetricCache, MetricCacheEntry
+from src.repositories.metric_plans import DISTINCT_USER_METRICS, TIME_SERIES_METRICS
+
+logger = logging.getLogger(__name__)
+
+WINDOW_STEP_SECONDS = 3600
+
+
+class CachedClickHouseRepository(ClickHouseRepositoryInterface):
+    def __init__(
+        self,
+        repository: ClickHouseRepositoryInterface,
+        cache: MetricCache,
+        ttl_seconds: dict[MetricType, float],
+        default_ttl_seconds: float,
+        late_arrival_seconds: int,
+        full_refresh_seconds: float,
+    ):
+        self._repository = repository
+        self._cache = cache
+        self._ttl_seconds = ttl_seconds
+        self._default_ttl_seconds = default_ttl_seconds
+        self._late_arrival_seconds = late_arrival_seconds
+        self._full_refresh_seconds = full_refresh_seconds
+
+    def get_ttl_seconds(self, metric_type: MetricType) -> float:
+        return self._ttl_seconds.get(metric_type, self._default_ttl_seconds)
+
+    async def get_metric_data(
+        self,
+        metric_type: MetricType,
+        time_range: MetricTimeRange | None = None,
+        recent_seconds: int | None = None,
+        accuracy: MetricAccuracy = MetricAccuracy.SKETCH,
+    ) -> MetricData:
+        if metric_type not in DISTINCT_USER_METRICS:
+            accuracy = MetricAccuracy.SKETCH
+        if recent_seconds is not None:
+            return await self._repository.get_metric_data(metric_type, time_range, recent_seconds, accuracy)
+
+        key = (metric_type, time_range, accuracy)
+        ttl_seconds = self.get_ttl_seconds(metric_type)
+        if metric_type in TIME_SERIES_METRICS:
+            stale = self._cache.peek(key)
+            return await self._cache.get_or_load(
+                key, ttl_seconds, lambda: self._refresh_series(metric_type, time_range, accuracy, stale)
+            )
+        return await self._cache.get_or_load(
+            key, ttl_seconds, lambda: self._repository.get_metric_data(metric_type, time_range, accuracy=accuracy)
+        )
+
+    async def _refresh_series(
+        self,
+        metric_type: MetricType,
+        time_range: MetricTimeRange | None,
+        accuracy: MetricAccuracy,
+        stale: MetricCacheEntry | None,
+    ) -> MetricData:
+        if stale is None or not isinstance(stale.value, TimeSeriesData) or not self._can_extend(stale, time_range):
+            return await self._repository.get_metric_data(metric_type, time_range, accuracy=accuracy)
+
+        recent = await self._repository.get_metric_data(metric_type, time_range, self._late_arrival_seconds, accuracy)
+        logger.debug(f"Refreshed {metric_type.value} from the last {self._late_arrival_seconds}s of buckets")
+        return stale.value.merged_with(recent)
+
+    def _can_extend(self, stale: MetricCacheEntry, time_range: MetricTimeRange | None) -> bool:
+        now = time.time()
+        if stale.stored_at // self._full_refresh_seconds != now // self._full_refresh_seconds:
+            return False
+        return time_range is not None or stale.stored_at // WINDOW_STEP_SECONDS == now // WINDOW_STEP_SECONDS
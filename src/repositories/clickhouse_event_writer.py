@@ -0,0 +1,19 @@
+from src.repositories.clickhouse_pool import ClickHouseConnectionPool
+
+
+class ClickHouseEventWriter:
+    def __init__(self, pool: ClickHouseConnectionPool, database: str):
+        self._pool = pool
+        self._database = database
+
+    async def insert_columns(
+        self,
+        table: str,
+        column_names: tuple[str, ...],
+        columns: list[list[object]],
+        deduplication_token: str | None = None,
+    ) -> int:
+        query = f"INSERT INTO {self._database}.{table} ({', '.join(column_names)}) VALUES"
+        settings = {"insert_deduplication_token": deduplication_token} if deduplication_token else None
+        async with self._pool.acquire() as connection:
+            return await connection.execute_columnar(query, args=columns, settings=settings)
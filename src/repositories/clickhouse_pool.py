@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from asynch.connection import Connection
+
+logger = logging.getLogger(__name__)
+
+
+class ClickHouseConnection(Connection):
+    async def execute_columnar(
+        self, query: str, args: object = None, settings: dict[str, object] | None = None
+    ) -> list[tuple] | int:
+        return await self._connection.execute(query, args=args, settings=settings, columnar=True)
+
+
+@dataclass
+class PooledConnection:
+    connection: ClickHouseConnection
+    last_used_at: float
+    last_checked_at: float
+
+
+@dataclass
+class ClickHousePoolStats:
+    min_size: int
+    max_size: int
+    size: int
+    idle: int
+    in_use: int
+    waiting: int
+    acquired_total: int
+    acquire_timeouts_total: int
+    health_check_failures_total: int
+    recycled_total: int
+    discarded_total: int
+
+
+class ClickHouseConnectionPool:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        database: str,
+        user: str,
+        password: str,
+        min_size: int,
+        max_size: int,
+        acquire_timeout_seconds: float,
+        max_idle_seconds: float,
+        health_check_interval_seconds: float,
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than zero")
+        if not 0 <= min_size <= max_size:
+            raise ValueError("min_size must be between zero and max_size")
+
+        self._connection_kwargs = {
+            "host": host,
+            "port": port,
+            "database": database,
+            "user": user,
+            "password": password,
+        }
+        self._min_size = min_size
+        self._max_size = max_size
+        self._acquire_timeout_seconds = acquire_timeout_seconds
+        self._max_idle_seconds = max_idle_seconds
+        self._health_check_interval_seconds = health_check_interval_seconds
+
+        self._slots = asyncio.Semaphore(max_size)
+        self._idle: deque[PooledConnection] = deque()
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        self._acquired_total = 0
+        self._acquire_timeouts_total = 0
+        self._health_check_failures_total = 0
+        self._recycled_total = 0
+        self._discarded_total = 0
+
+    async def open(self) -> None:
+        self._closed = False
+        while len(self._idle) < self._min_size:
+            self._idle.append(await self._create())
+        logger.info(f"ClickHouse pool opened with {len(self._idle)} connections (max {self._max_size})")
+
+    async def close(self) -> None:
+        self._closed = True
+        while self._idle:
+            await self._discard(self._idle.popleft())
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[ClickHouseConnection]:
+        if self._closed:
+            raise RuntimeError("ClickHouse pool is closed")
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self._acquire_timeout_seconds)
+        except TimeoutError:
+            self._acquire_timeouts_total += 1
+            raise
+        finally:
+            self._waiting -= 1
+
+        self._in_use += 1
+        pooled: PooledConnection | None = None
+        try:
+            pooled = await self._checkout()
+            self._acquired_total += 1
+            yield pooled.connection
+        except BaseException:
+            if pooled is not None:
+                await self._discard(pooled)
+                pooled = None
+            raise
+        finally:
+            if pooled is not None:
+                pooled.last_used_at = time.monotonic()
+                if self._closed:
+                    await self._discard(pooled)
+                else:
+                    self._idle.append(pooled)
+                    await self._prune_idle()
+            self._in_use -= 1
+            self._slots.release()
+
+    def stats(self) -> ClickHousePoolStats:
+        return ClickHousePoolStats(
+            min_size=self._min_size,
+            max_size=self._max_size,
+            size=len(self._idle) + self._in_use,
+            idle=len(self._idle),
+            in_use=self._in_use,
+            waiting=self._waiting,
+            acquired_total=self._acquired_total,
+            acquire_timeouts_total=self._acquire_timeouts_total,
+            health_check_failures_total=self._health_check_failures_total,
+            recycled_total=self._recycled_total,
+            discarded_total=self._discarded_total,
+        )
+
+    async def _checkout(self) -> PooledConnection:
+        while self._idle:
+            pooled = self._idle.pop()
+            now = time.monotonic()
+
+            if now - pooled.last_used_at > self._max_idle_seconds:
+                self._recycled_total += 1
+                await self._discard(pooled)
+                continue
+
+            if now - pooled.last_checked_at > self._health_check_interval_seconds:
+                if not await self._is_healthy(pooled):
+                    self._health_check_failures_total += 1
+                    await self._discard(pooled)
+                    continue
+                pooled.last_checked_at = now
+
+            return pooled
+
+        return await self._create()
+
+    async def _prune_idle(self) -> None:
+        now = time.monotonic()
+        while len(self._idle) > self._min_size and now - self._idle[0].last_used_at > self._max_idle_seconds:
+            self._recycled_total += 1
+            await self._discard(self._idle.popleft())
+
+    async def _create(self) -> PooledConnection:
+        connection = ClickHouseConnection(**self._connection_kwargs)
+        await connection.connect()
+        now = time.monotonic()
+        return PooledConnection(connection=connection, last_used_at=now, last_checked_at=now)
+
+    async def _is_healthy(self, pooled: PooledConnection) -> bool:
+        try:
+            async with pooled.connection.cursor() as cursor:
+                await cursor.execute("SELECT 1")
+                await cursor.fetchall()
+            return True
+        except Exception as e:
+            logger.warning(f"ClickHouse connection failed health check: {e}")
+            return False
+
+    async def _discard(self, pooled: PooledConnection) -> None:
+        self._discarded_total += 1
+        try:
+            await pooled.connection.close()
+        except Exception as e:
+            logger.warning(f"Failed to close ClickHouse connection: {e}")
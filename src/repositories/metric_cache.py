@@ -0,0 +1,110 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+from src.dto.dashboard.metric_data import MetricData
+from src.repositories.shared_metric_store import SharedMetricStore
+
+
+@dataclass
+class MetricCacheEntry:
+    value: MetricData
+    expires_at: float
+    stored_at: float
+
+
+@dataclass
+class MetricCacheStats:
+    max_entries: int
+    size: int
+    in_flight: int
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    shared_hits: int
+
+
+class MetricCache:
+    def __init__(self, max_entries: int, shared_store: SharedMetricStore | None = None):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than zero")
+
+        self._max_entries = max_entries
+        self._shared_store = shared_store
+        self._entries: OrderedDict[Hashable, MetricCacheEntry] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Task[MetricData]] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    async def get_or_load(
+        self, key: Hashable, ttl_seconds: float, loader: Callable[[], Awaitable[MetricData]]
+    ) -> MetricData:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self._coalesced += 1
+            return await asyncio.shield(in_flight)
+
+        self._misses += 1
+        task = asyncio.create_task(self._load(key, ttl_seconds, loader))
+        task.add_done_callback(self._consume_exception)
+        self._in_flight[key] = task
+        return await asyncio.shield(task)
+
+    def peek(self, key: Hashable) -> MetricCacheEntry | None:
+        return self._entries.get(key)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> MetricCacheStats:
+        return MetricCacheStats(
+            max_entries=self._max_entries,
+            size=len(self._entries),
+            in_flight=len(self._in_flight),
+            hits=self._hits,
+            misses=self._misses,
+            coalesced=self._coalesced,
+            evictions=self._evictions,
+            shared_hits=self._shared_store.hits if self._shared_store is not None else 0,
+        )
+
+    async def _load(self, key: Hashable, ttl_seconds: float, loader: Callable[[], Awaitable[MetricData]]) -> MetricData:
+        try:
+            if self._shared_store is not None and ttl_seconds > 0:
+                value, ttl_seconds = await self._shared_store.get_or_load(key, ttl_seconds, loader)
+            else:
+                value = await loader()
+            if ttl_seconds > 0:
+                self._store(key, value, ttl_seconds)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    def _store(self, key: Hashable, value: MetricData, ttl_seconds: float) -> None:
+        self._entries[key] = MetricCacheEntry(
+            value=value, expires_at=time.monotonic() + ttl_seconds, stored_at=time.time()
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    @staticmethod
+    def _consume_exception(task: asyncio.Task[MetricData]) -> None:
+        if not task.cancelled():
+            task.exception()
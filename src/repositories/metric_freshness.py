@@ -0,0 +1,34 @@
+from src.enums import MetricType
+
+TODAY_METRIC_TTL_SECONDS = 10.0
+WEEKLY_METRIC_TTL_SECONDS = 60.0
+MONTHLY_METRIC_TTL_SECONDS = 300.0
+
+METRIC_TTL_SECONDS: dict[MetricType, float] = {
+    MetricType.DAU: TODAY_METRIC_TTL_SECONDS,
+    MetricType.NEW_REGISTRATIONS_TODAY: TODAY_METRIC_TTL_SECONDS,
+    MetricType.DAILY_REVENUE: TODAY_METRIC_TTL_SECONDS,
+    MetricType.TOTAL_TRANSACTIONS_TODAY: TODAY_METRIC_TTL_SECONDS,
+    MetricType.WAU: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.AVERAGE_ORDER_VALUE: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.ARPU_7_DAYS: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.TOP_PAGES_BY_VIEWS: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.CART_ABANDONMENT_RATE: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.SEARCH_QUERIES: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.USER_JOURNEY_FUNNEL: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.TRANSACTION_VOLUME_BY_CURRENCY: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.MOST_CLICKED_ELEMENTS: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.FILTER_USAGE: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.CONVERSION_RATE_CART_TO_PURCHASE: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.USER_ENGAGEMENT_SCORE: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.MOST_ACTIVE_EVENT_TYPE: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.TOTAL_PAGE_VIEWS: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.TOP_PERFORMING_PRODUCTS: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.ACTIVITY_BY_HOUR: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.EVENT_TYPE_DISTRIBUTION: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.DAILY_ACTIVITY_TREND: WEEKLY_METRIC_TTL_SECONDS,
+    MetricType.MAU: MONTHLY_METRIC_TTL_SECONDS,
+    MetricType.REVENUE_TREND_30_DAYS: MONTHLY_METRIC_TTL_SECONDS,
+    MetricType.USER_ACTIVITY_TREND_30_DAYS: MONTHLY_METRIC_TTL_SECONDS,
+    MetricType.USER_REGISTRATION_TREND: MONTHLY_METRIC_TTL_SECONDS,
+}
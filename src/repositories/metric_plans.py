@@ -0,0 +1,339 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from src.dto.dashboard.metric_data import (
+    ActivityByHourData,
+    ActivityPoint,
+    ArpuSevenDaysData,
+    AverageOrderValueData,
+    CartAbandonmentRateData,
+    ClickedElementRow,
+    ColumnarRows,
+    ConversionRateCartToPurchaseData,
+    CurrencyVolumeRow,
+    DailyActivityTrendData,
+    DailyRevenueData,
+    DauData,
+    EventDistributionRow,
+    EventTypeDistributionData,
+    FilterUsageData,
+    FilterUsageRow,
+    FunnelPoint,
+    HourlyActivityRow,
+    MauData,
+    MetricData,
+    MostActiveEventTypeData,
+    MostClickedElementsData,
+    NewRegistrationsTodayData,
+    PageViewRow,
+    ProductRow,
+    RegistrationPoint,
+    RevenuePoint,
+    RevenueTrendThirtyDaysData,
+    SearchQueriesData,
+    SearchQueryRow,
+    TopPagesByViewsData,
+    TopPerformingProductsData,
+    TotalPageViewsData,
+    TotalTransactionsTodayData,
+    TransactionVolumeByCurrencyData,
+    UserActivityPoint,
+    UserActivityTrendThirtyDaysData,
+    UserEngagementScoreData,
+    UserJourneyFunnelData,
+    UserRegistrationTrendData,
+    WauData,
+)
+from src.enums import MetricType
+from src.repositories.metric_query_planner import TIME_BUCKET_KEY, Aggregate, MetricInput, MetricWindow, ScanTable
+
+USERS = Aggregate("uniqMerge", "users")
+EVENTS = Aggregate("sum", "events")
+REVENUE = Aggregate("sum", "revenue")
+TRANSACTIONS = Aggregate("sum", "transactions")
+
+INTERACTION_DIMENSION_KEY = (
+    "multiIf(event_type = 'page_view', page, event_type = 'search', query, "
+    "event_type = 'element_click', element_name, event_type = 'filter_applied', filter_name, item_id)"
+)
+
+USER_EVENTS_HOURLY = ScanTable(
+    name="user_events_hourly",
+    keys=((TIME_BUCKET_KEY, "toDate(hour, 'UTC')"),),
+    raw_source=(
+        "SELECT toStartOfHour(timestamp) AS hour, event_type, 1 AS events, user_id AS users FROM user_events_storage"
+    ),
+)
+TRANSACTION_EVENTS_HOURLY = ScanTable(
+    name="transaction_events_hourly",
+    keys=((TIME_BUCKET_KEY, "toDate(hour, 'UTC')"), ("currency", "currency")),
+    raw_source=(
+        "SELECT toStartOfHour(timestamp) AS hour, currency, 1 AS transactions, amount AS revenue, user_id AS users "
+        "FROM transaction_events_storage"
+    ),
+)
+INTERACTION_EVENTS_HOURLY = ScanTable(
+    name="interaction_events_hourly",
+    keys=(
+        ("event_type", "event_type"),
+        (TIME_BUCKET_KEY, "toDate(hour, 'UTC')"),
+        ("hour_of_day", "toHour(hour, 'UTC')"),
+    ),
+    raw_source=(
+        "SELECT toStartOfHour(timestamp) AS hour, event_type, 1 AS events, user_id AS users "
+        "FROM interaction_events_storage"
+    ),
+)
+INTERACTION_DIMENSIONS_HOURLY = ScanTable(
+    name="interaction_dimensions_hourly",
+    keys=(("event_type", "event_type"), ("dimension_key", "dimension_key"), ("dimension_value", "dimension_value")),
+    partition_key="event_type",
+    rank=EVENTS,
+    raw_source=(
+        "SELECT toStartOfHour(timestamp) AS hour, event_type, "
+        f"assumeNotNull({INTERACTION_DIMENSION_KEY}) AS dimension_key, "
+        "if(event_type = 'filter_applied', ifNull(filter_value, ''), '') AS dimension_value, "
+        "1 AS events, user_id AS users "
+        "FROM interaction_events_storage "
+        "WHERE event_type IN ('page_view', 'search', 'element_click', 'filter_applied', 'item_added_to_cart') "
+        f"AND {INTERACTION_DIMENSION_KEY} IS NOT NULL"
+    ),
+)
+
+USER_LOGINS = (("event_type", "user_login"),)
+USER_REGISTRATIONS = (("event_type", "user_registered"),)
+
+CART_USERS_7_DAYS = MetricInput(
+    INTERACTION_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (USERS,), where=(("event_type", "item_added_to_cart"),)
+)
+PURCHASE_USERS_7_DAYS = MetricInput(TRANSACTION_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (USERS,))
+TRANSACTIONS_7_DAYS = MetricInput(TRANSACTION_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (TRANSACTIONS,))
+INTERACTIONS_BY_EVENT_TYPE = MetricInput(
+    INTERACTION_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (EVENTS,), keys=("event_type",)
+)
+
+
+@dataclass(frozen=True)
+class MetricPlan:
+    inputs: tuple[MetricInput, ...]
+    build: Callable[..., MetricData]
+
+
+def _scalar(columns: list[tuple], default: object = 0) -> object:
+    return columns[0][0] if columns and columns[0] else default
+
+
+def _ordered(columns: list[tuple], by: int, descending: bool = False, limit: int | None = None) -> list[tuple]:
+    rows = sorted(zip(*columns), key=lambda row: row[by], reverse=descending)[:limit]
+    return [tuple(column) for column in zip(*rows)] if rows else columns
+
+
+def _ratio(numerator: object, denominator: object) -> float:
+    return float(numerator) / float(denominator) if denominator else 0.0
+
+
+def _value_plan(data_type: type[MetricData], metric_input: MetricInput, default: object = 0) -> MetricPlan:
+    return MetricPlan(inputs=(metric_input,), build=lambda columns: data_type(value=_scalar(columns, default)))
+
+
+def _rows_plan(
+    data_type: type[MetricData],
+    row_type: type,
+    metric_input: MetricInput,
+    order_by: int,
+    descending: bool = False,
+) -> MetricPlan:
+    return MetricPlan(
+        inputs=(metric_input,),
+        build=lambda columns: data_type(
+            ColumnarRows(row_type, _ordered(columns, order_by, descending, metric_input.limit))
+        ),
+    )
+
+
+def _top_dimension_plan(
+    data_type: type[MetricData],
+    row_type: type,
+    event_type: str,
+    limit: int,
+    keys: tuple[str, ...] = ("dimension_key",),
+    aggregates: tuple[Aggregate, ...] = (EVENTS,),
+) -> MetricPlan:
+    metric_input = MetricInput(
+        INTERACTION_DIMENSIONS_HOURLY,
+        MetricWindow.LAST_7_DAYS,
+        aggregates,
+        keys=keys,
+        where=(("event_type", event_type),),
+        limit=limit,
+    )
+    return _rows_plan(data_type, row_type, metric_input, order_by=len(keys), descending=True)
+
+
+def _build_average_order_value(columns: list[tuple]) -> AverageOrderValueData:
+    return AverageOrderValueData(value=_ratio(_scalar(columns[:1]), _scalar(columns[1:])))
+
+
+def _build_arpu(columns: list[tuple]) -> ArpuSevenDaysData:
+    return ArpuSevenDaysData(value=_ratio(_scalar(columns[:1]), _scalar(columns[1:])))
+
+
+def _build_user_engagement_score(columns: list[tuple]) -> UserEngagementScoreData:
+    return UserEngagementScoreData(value=round(_ratio(_scalar(columns[:1]), _scalar(columns[1:])), 2))
+
+
+def _build_most_active_event_type(columns: list[tuple]) -> MostActiveEventTypeData:
+    return MostActiveEventTypeData(value=_scalar(_ordered(columns, by=1, descending=True, limit=1), ""))
+
+
+def _build_user_journey_funnel(columns: list[tuple]) -> UserJourneyFunnelData:
+    columns = _ordered(columns, by=0)
+    if columns:
+        columns = [columns[0], *(tuple(value or 0 for value in column) for column in columns[1:])]
+    return UserJourneyFunnelData(points=ColumnarRows(FunnelPoint, columns))
+
+
+def _build_cart_abandonment_rate(cart_users: list[tuple], purchase_users: list[tuple]) -> CartAbandonmentRateData:
+    cart, purchases = _scalar(cart_users), _scalar(purchase_users)
+    return CartAbandonmentRateData(value=round((1 - purchases / cart) * 100, 2) if cart > 0 else 0.0)
+
+
+def _build_conversion_rate(transactions: list[tuple], cart_users: list[tuple]) -> ConversionRateCartToPurchaseData:
+    count, cart = _scalar(transactions), _scalar(cart_users)
+    return ConversionRateCartToPurchaseData(value=round(count * 100.0 / cart, 2) if cart > 0 else 0.0)
+
+
+METRIC_PLANS: dict[MetricType, MetricPlan] = {
+    MetricType.DAU: _value_plan(
+        DauData, MetricInput(USER_EVENTS_HOURLY, MetricWindow.TODAY, (USERS,), where=USER_LOGINS)
+    ),
+    MetricType.WAU: _value_plan(
+        WauData, MetricInput(USER_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (USERS,), where=USER_LOGINS)
+    ),
+    MetricType.MAU: _value_plan(
+        MauData, MetricInput(USER_EVENTS_HOURLY, MetricWindow.LAST_30_DAYS, (USERS,), where=USER_LOGINS)
+    ),
+    MetricType.NEW_REGISTRATIONS_TODAY: _value_plan(
+        NewRegistrationsTodayData,
+        MetricInput(USER_EVENTS_HOURLY, MetricWindow.TODAY, (EVENTS,), where=USER_REGISTRATIONS),
+    ),
+    MetricType.USER_ACTIVITY_TREND_30_DAYS: _rows_plan(
+        UserActivityTrendThirtyDaysData,
+        UserActivityPoint,
+        MetricInput(
+            USER_EVENTS_HOURLY, MetricWindow.LAST_30_DAYS, (USERS,), keys=(TIME_BUCKET_KEY,), where=USER_LOGINS
+        ),
+        order_by=0,
+    ),
+    MetricType.USER_REGISTRATION_TREND: _rows_plan(
+        UserRegistrationTrendData,
+        RegistrationPoint,
+        MetricInput(
+            USER_EVENTS_HOURLY, MetricWindow.LAST_30_DAYS, (EVENTS,), keys=(TIME_BUCKET_KEY,), where=USER_REGISTRATIONS
+        ),
+        order_by=0,
+    ),
+    MetricType.DAILY_REVENUE: _value_plan(
+        DailyRevenueData, MetricInput(TRANSACTION_EVENTS_HOURLY, MetricWindow.TODAY, (REVENUE,)), 0.0
+    ),
+    MetricType.TOTAL_TRANSACTIONS_TODAY: _value_plan(
+        TotalTransactionsTodayData, MetricInput(TRANSACTION_EVENTS_HOURLY, MetricWindow.TODAY, (TRANSACTIONS,))
+    ),
+    MetricType.AVERAGE_ORDER_VALUE: MetricPlan(
+        inputs=(MetricInput(TRANSACTION_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (REVENUE, TRANSACTIONS)),),
+        build=_build_average_order_value,
+    ),
+    MetricType.ARPU_7_DAYS: MetricPlan(
+        inputs=(MetricInput(TRANSACTION_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (REVENUE, USERS)),),
+        build=_build_arpu,
+    ),
+    MetricType.REVENUE_TREND_30_DAYS: _rows_plan(
+        RevenueTrendThirtyDaysData,
+        RevenuePoint,
+        MetricInput(TRANSACTION_EVENTS_HOURLY, MetricWindow.LAST_30_DAYS, (REVENUE,), keys=(TIME_BUCKET_KEY,)),
+        order_by=0,
+    ),
+    MetricType.TRANSACTION_VOLUME_BY_CURRENCY: _rows_plan(
+        TransactionVolumeByCurrencyData,
+        CurrencyVolumeRow,
+        MetricInput(TRANSACTION_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (TRANSACTIONS, REVENUE), keys=("currency",)),
+        order_by=1,
+        descending=True,
+    ),
+    MetricType.USER_ENGAGEMENT_SCORE: MetricPlan(
+        inputs=(MetricInput(INTERACTION_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (EVENTS, USERS)),),
+        build=_build_user_engagement_score,
+    ),
+    MetricType.MOST_ACTIVE_EVENT_TYPE: MetricPlan(
+        inputs=(INTERACTIONS_BY_EVENT_TYPE,), build=_build_most_active_event_type
+    ),
+    MetricType.TOTAL_PAGE_VIEWS: _value_plan(
+        TotalPageViewsData,
+        MetricInput(
+            INTERACTION_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (EVENTS,), where=(("event_type", "page_view"),)
+        ),
+    ),
+    MetricType.EVENT_TYPE_DISTRIBUTION: _rows_plan(
+        EventTypeDistributionData, EventDistributionRow, INTERACTIONS_BY_EVENT_TYPE, order_by=1, descending=True
+    ),
+    MetricType.ACTIVITY_BY_HOUR: _rows_plan(
+        ActivityByHourData,
+        HourlyActivityRow,
+        MetricInput(INTERACTION_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (EVENTS,), keys=("hour_of_day",)),
+        order_by=0,
+    ),
+    MetricType.DAILY_ACTIVITY_TREND: _rows_plan(
+        DailyActivityTrendData,
+        ActivityPoint,
+        MetricInput(INTERACTION_EVENTS_HOURLY, MetricWindow.LAST_7_DAYS, (EVENTS,), keys=(TIME_BUCKET_KEY,)),
+        order_by=0,
+    ),
+    MetricType.USER_JOURNEY_FUNNEL: MetricPlan(
+        inputs=(
+            MetricInput(
+                INTERACTION_EVENTS_HOURLY,
+                MetricWindow.LAST_7_DAYS,
+                (
+                    Aggregate("uniqMerge", "users", (("event_type", "page_view"),)),
+                    Aggregate("uniqMerge", "users", (("event_type", "item_added_to_cart"),)),
+                    Aggregate("uniqMerge", "users", (("event_type", "search"),)),
+                ),
+                keys=(TIME_BUCKET_KEY,),
+            ),
+        ),
+        build=_build_user_journey_funnel,
+    ),
+    MetricType.CART_ABANDONMENT_RATE: MetricPlan(
+        inputs=(CART_USERS_7_DAYS, PURCHASE_USERS_7_DAYS), build=_build_cart_abandonment_rate
+    ),
+    MetricType.CONVERSION_RATE_CART_TO_PURCHASE: MetricPlan(
+        inputs=(TRANSACTIONS_7_DAYS, CART_USERS_7_DAYS), build=_build_conversion_rate
+    ),
+    MetricType.TOP_PAGES_BY_VIEWS: _top_dimension_plan(TopPagesByViewsData, PageViewRow, "page_view", limit=10),
+    MetricType.SEARCH_QUERIES: _top_dimension_plan(SearchQueriesData, SearchQueryRow, "search", limit=10),
+    MetricType.MOST_CLICKED_ELEMENTS: _top_dimension_plan(
+        MostClickedElementsData, ClickedElementRow, "element_click", limit=10
+    ),
+    MetricType.FILTER_USAGE: _top_dimension_plan(
+        FilterUsageData, FilterUsageRow, "filter_applied", limit=15, keys=("dimension_key", "dimension_value")
+    ),
+    MetricType.TOP_PERFORMING_PRODUCTS: _top_dimension_plan(
+        TopPerformingProductsData, ProductRow, "item_added_to_cart", limit=10, aggregates=(EVENTS, USERS)
+    ),
+}
+
+TIME_SERIES_METRICS: frozenset[MetricType] = frozenset(
+    {
+        MetricType.REVENUE_TREND_30_DAYS,
+        MetricType.USER_ACTIVITY_TREND_30_DAYS,
+        MetricType.USER_REGISTRATION_TREND,
+        MetricType.DAILY_ACTIVITY_TREND,
+        MetricType.USER_JOURNEY_FUNNEL,
+    }
+)
+
+DISTINCT_USER_METRICS: frozenset[MetricType] = frozenset(
+    metric_type
+    for metric_type, plan in METRIC_PLANS.items()
+    if any(metric_input.counts_distinct for metric_input in plan.inputs)
+)
@@ -0,0 +1,281 @@
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import IntEnum
+
+from src.dto.dashboard.time_range import MetricTimeRange
+from src.enums import MetricAccuracy, MetricGranularity
+
+TIME_BUCKET_KEY = "bucket"
+TIME_RANGE_CONDITION = "hour >= toDateTime(%(range_start)s, 'UTC') AND hour < toDateTime(%(range_end)s, 'UTC')"
+TIME_BUCKET_EXPRESSIONS: dict[MetricGranularity, str] = {
+    MetricGranularity.HOUR: "hour",
+    MetricGranularity.DAY: "toDate(hour, 'UTC')",
+    MetricGranularity.WEEK: "toMonday(hour, 'UTC')",
+}
+TIME_BUCKET_STARTS: dict[MetricGranularity | None, str] = {
+    None: "toStartOfDay({moment}, 'UTC')",
+    MetricGranularity.HOUR: "toStartOfHour({moment})",
+    MetricGranularity.DAY: "toStartOfDay({moment}, 'UTC')",
+    MetricGranularity.WEEK: "toDateTime(toMonday({moment}, 'UTC'), 'UTC')",
+}
+
+DISTINCT_FUNCTIONS: dict[MetricAccuracy, str] = {
+    MetricAccuracy.SKETCH: "uniqMerge",
+    MetricAccuracy.EXACT: "uniqExact",
+    MetricAccuracy.COMBINED: "uniqCombined",
+    MetricAccuracy.HLL: "uniqHLL12",
+    MetricAccuracy.SAMPLED: "uniq",
+}
+DISTINCT_RELATIVE_ERRORS: dict[MetricAccuracy, float] = {
+    MetricAccuracy.SKETCH: 0.0039,
+    MetricAccuracy.EXACT: 0.0,
+    MetricAccuracy.COMBINED: 0.0029,
+    MetricAccuracy.HLL: 0.0163,
+    MetricAccuracy.SAMPLED: 0.0039,
+}
+
+
+class MetricWindow(IntEnum):
+    TODAY = 1
+    LAST_7_DAYS = 7
+    LAST_30_DAYS = 30
+
+    @property
+    def condition(self) -> str:
+        if self == MetricWindow.TODAY:
+            return "hour >= toStartOfDay(now(), 'UTC')"
+        return f"hour >= toStartOfHour(now() - INTERVAL {self.value} DAY)"
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    function: str
+    argument: str
+    where: tuple[tuple[str, str], ...] = ()
+
+
+@dataclass(frozen=True)
+class ScanTable:
+    name: str
+    keys: tuple[tuple[str, str], ...]
+    partition_key: str | None = None
+    rank: Aggregate | None = None
+    raw_source: str | None = None
+
+    def key_names(self) -> tuple[str, ...]:
+        return tuple(name for name, _ in self.keys)
+
+
+@dataclass(frozen=True)
+class MetricInput:
+    table: ScanTable
+    window: MetricWindow
+    aggregates: tuple[Aggregate, ...]
+    keys: tuple[str, ...] = ()
+    where: tuple[tuple[str, str], ...] = ()
+    limit: int | None = None
+
+    @property
+    def partition_value(self) -> str | None:
+        return dict(self.where).get(self.table.partition_key) if self.table.partition_key else None
+
+    @property
+    def counts_distinct(self) -> bool:
+        return any(aggregate.function == DISTINCT_FUNCTIONS[MetricAccuracy.SKETCH] for aggregate in self.aggregates)
+
+    @property
+    def group_keys(self) -> tuple[str, ...]:
+        keys = set(self.keys)
+        if self.partition_value is not None:
+            keys.add(self.table.partition_key)
+        return tuple(name for name in self.table.key_names() if name in keys)
+
+    def condition(self, window_condition: str) -> str:
+        filters = [(column, value) for column, value in self.where if column != self.table.partition_key]
+        return _conjunction(window_condition, filters)
+
+
+@dataclass(frozen=True)
+class TableScan:
+    table: ScanTable
+    inputs: tuple[MetricInput, ...]
+    keys: tuple[str, ...]
+    columns: tuple[str, ...]
+    aggregate_columns: dict[MetricInput, tuple[str, ...]]
+    presence_columns: dict[MetricInput, str]
+    sql: str
+    parameters: dict[str, object] | None = None
+
+    def split(self, columns: list[tuple]) -> dict[MetricInput, list[tuple]]:
+        positions = {name: index for index, name in enumerate(self.columns)}
+        if not columns:
+            columns = [() for _ in self.columns]
+        row_count = len(columns[0])
+
+        results: dict[MetricInput, list[tuple]] = {}
+        for metric_input in self.inputs:
+            rows = range(row_count)
+            if self.keys:
+                mask = _grouping_mask(self.keys, metric_input.group_keys)
+                rows = [row for row in rows if columns[positions["grouping_set"]][row] == mask]
+            if metric_input.partition_value is not None:
+                partition_column = columns[positions[self.table.partition_key]]
+                rows = [row for row in rows if partition_column[row] == metric_input.partition_value]
+            if metric_input in self.presence_columns:
+                presence_column = columns[positions[self.presence_columns[metric_input]]]
+                rows = [row for row in rows if presence_column[row] > 0]
+
+            names = (*metric_input.keys, *self.aggregate_columns[metric_input])
+            results[metric_input] = [tuple(columns[positions[name]][row] for row in rows) for name in names]
+        return results
+
+
+class MetricQueryPlanner:
+    def __init__(self, sampling_factor: int = 10):
+        self._sampling_factor = sampling_factor
+
+    def plan(
+        self,
+        inputs: Iterable[MetricInput],
+        time_range: MetricTimeRange | None = None,
+        recent_seconds: int | None = None,
+        accuracy: MetricAccuracy = MetricAccuracy.SKETCH,
+    ) -> list[TableScan]:
+        by_table: dict[tuple[ScanTable, MetricAccuracy], list[MetricInput]] = {}
+        for metric_input in dict.fromkeys(inputs):
+            raw = metric_input.counts_distinct and metric_input.table.raw_source is not None
+            table_accuracy = accuracy if raw else MetricAccuracy.SKETCH
+            by_table.setdefault((metric_input.table, table_accuracy), []).append(metric_input)
+        return [
+            self._plan_table(table, tuple(table_inputs), time_range, recent_seconds, table_accuracy)
+            for (table, table_accuracy), table_inputs in by_table.items()
+        ]
+
+    def _plan_table(
+        self,
+        table: ScanTable,
+        inputs: tuple[MetricInput, ...],
+        time_range: MetricTimeRange | None,
+        recent_seconds: int | None,
+        accuracy: MetricAccuracy,
+    ) -> TableScan:
+        group_keys = {name for metric_input in inputs for name in metric_input.group_keys}
+        keys = tuple(name for name in table.key_names() if name in group_keys)
+        key_expressions = dict(table.keys)
+        if time_range is not None and TIME_BUCKET_KEY in key_expressions:
+            key_expressions[TIME_BUCKET_KEY] = TIME_BUCKET_EXPRESSIONS[time_range.granularity]
+
+        def window_condition(metric_input: MetricInput) -> str:
+            return TIME_RANGE_CONDITION if time_range is not None else metric_input.window.condition
+
+        expressions: dict[str, str] = {}
+        aggregate_columns: dict[MetricInput, tuple[str, ...]] = {}
+        presence_columns: dict[MetricInput, str] = {}
+        for metric_input in inputs:
+            condition = metric_input.condition(window_condition(metric_input))
+            aggregate_columns[metric_input] = tuple(
+                self._column(expressions, "m", self._aggregate_sql(aggregate, condition, accuracy))
+                for aggregate in metric_input.aggregates
+            )
+            if metric_input.group_keys:
+                presence_columns[metric_input] = self._column(expressions, "p", f"countIf({condition})")
+
+        select = [f"{key_expressions[name]} AS {name}" for name in keys]
+        select += [f"{expression} AS {alias}" for expression, alias in expressions.items()]
+        if keys:
+            select.insert(0, f"grouping({', '.join(keys)}) AS grouping_set")
+
+        source = table.name if accuracy == MetricAccuracy.SKETCH else f"({table.raw_source})"
+        sql = (
+            f"SELECT {', '.join(select)}\n"
+            f"FROM {source}\n"
+            f"WHERE {window_condition(max(inputs, key=lambda metric_input: metric_input.window))}"
+        )
+        if accuracy == MetricAccuracy.SAMPLED:
+            sql += f" AND modulo(cityHash64(users), {self._sampling_factor}) = 0"
+        if recent_seconds is not None:
+            granularity = time_range.granularity if time_range is not None else None
+            moment = f"now() - INTERVAL {int(recent_seconds)} SECOND"
+            sql += f" AND hour >= {TIME_BUCKET_STARTS[granularity].format(moment=moment)}"
+        for column, values in self._shared_filters(inputs).items():
+            sql += f" AND {column} IN ({', '.join(_quote(value) for value in values)})"
+        if keys:
+            grouping_sets = dict.fromkeys(metric_input.group_keys for metric_input in inputs)
+            sets_sql = ", ".join(f"({', '.join(grouping_set)})" for grouping_set in grouping_sets)
+            sql += f"\nGROUP BY GROUPING SETS ({sets_sql})"
+            limit = self._shared_limit(table, inputs, time_range)
+            if limit is not None:
+                limit_by = ", ".join(
+                    ("grouping_set", table.partition_key) if table.partition_key else ("grouping_set",)
+                )
+                sql += (
+                    f"\nORDER BY {self._aggregate_sql(table.rank, window_condition(inputs[0]))} DESC"
+                    f"\nLIMIT {limit} BY {limit_by}"
+                )
+            sql += "\nSETTINGS force_grouping_standard_compatibility = 1"
+
+        columns = (*(("grouping_set",) if keys else ()), *keys, *expressions.values())
+        return TableScan(
+            table=table,
+            inputs=inputs,
+            keys=keys,
+            columns=columns,
+            aggregate_columns=aggregate_columns,
+            presence_columns=presence_columns,
+            sql=sql,
+            parameters={"range_start": time_range.start, "range_end": time_range.end} if time_range else None,
+        )
+
+    def _column(self, expressions: dict[str, str], prefix: str, expression: str) -> str:
+        if expression not in expressions:
+            expressions[expression] = f"{prefix}{len(expressions)}"
+        return expressions[expression]
+
+    def _aggregate_sql(
+        self, aggregate: Aggregate, condition: str, accuracy: MetricAccuracy = MetricAccuracy.SKETCH
+    ) -> str:
+        function = aggregate.function
+        if function == DISTINCT_FUNCTIONS[MetricAccuracy.SKETCH]:
+            function = DISTINCT_FUNCTIONS[accuracy]
+        sql = f"{function}If({aggregate.argument}, {_conjunction(condition, aggregate.where)})"
+        return f"{self._sampling_factor} * {sql}" if accuracy == MetricAccuracy.SAMPLED else sql
+
+    def _shared_filters(self, inputs: tuple[MetricInput, ...]) -> dict[str, list[str]]:
+        filters = [dict(metric_input.where) for metric_input in inputs]
+        shared = set.intersection(*(set(where) for where in filters))
+        return {column: sorted({where[column] for where in filters}) for column in sorted(shared)}
+
+    def _shared_limit(
+        self, table: ScanTable, inputs: tuple[MetricInput, ...], time_range: MetricTimeRange | None
+    ) -> int | None:
+        keyed = [metric_input for metric_input in inputs if metric_input.group_keys]
+        if table.rank is None or any(metric_input.limit is None for metric_input in keyed):
+            return None
+        if time_range is None and len({metric_input.window for metric_input in inputs}) > 1:
+            return None
+        return max(metric_input.limit for metric_input in keyed)
+
+
+def distinct_relative_error(
+    accuracy: MetricAccuracy, sampling_factor: int, estimate: float | None = None
+) -> float | None:
+    error = DISTINCT_RELATIVE_ERRORS[accuracy]
+    if accuracy != MetricAccuracy.SAMPLED:
+        return error
+    if not estimate:
+        return None
+    return error + math.sqrt((sampling_factor - 1) / estimate)
+
+
+def _grouping_mask(scan_keys: tuple[str, ...], group_keys: tuple[str, ...]) -> int:
+    width = len(scan_keys)
+    return sum(1 << (width - 1 - index) for index, name in enumerate(scan_keys) if name not in group_keys)
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _conjunction(condition: str, filters: Iterable[tuple[str, str]]) -> str:
+    return " AND ".join((condition, *(f"{column} = {_quote(value)}" for column, value in filters)))
@@ -0,0 +1,118 @@
+import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from pathlib import Path
+
+from src.dto.dashboard.metric_data import MetricData
+
+logger = logging.getLogger(__name__)
+
+EXPIRY_HEADER = struct.Struct("<d")
+
+
+class SharedMetricStore:
+    def __init__(
+        self,
+        directory: str,
+        lock_poll_seconds: float = 0.02,
+        lock_timeout_seconds: float = 10.0,
+        prune_every: int = 256,
+    ):
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._lock_poll_seconds = lock_poll_seconds
+        self._lock_timeout_seconds = lock_timeout_seconds
+        self._prune_every = prune_every
+        self._writes = 0
+        self._hits = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    async def get_or_load(
+        self, key: Hashable, ttl_seconds: float, loader: Callable[[], Awaitable[MetricData]]
+    ) -> tuple[MetricData, float]:
+        path = self._path(key)
+        deadline = time.monotonic() + self._lock_timeout_seconds
+        while True:
+            stored = await asyncio.to_thread(self._read, path)
+            if stored is not None:
+                self._hits += 1
+                return stored
+            lock = await asyncio.to_thread(self._try_lock, path)
+            if lock is not None:
+                break
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting for shared metric entry {path.name}, loading it locally")
+                return await loader(), ttl_seconds
+            await asyncio.sleep(self._lock_poll_seconds)
+
+        try:
+            stored = await asyncio.to_thread(self._read, path)
+            if stored is not None:
+                self._hits += 1
+                return stored
+            value = await loader()
+            await asyncio.to_thread(self._write, path, value, ttl_seconds)
+            return value, ttl_seconds
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+            os.close(lock)
+
+    def _path(self, key: Hashable) -> Path:
+        return self._directory / hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+
+    def _read(self, path: Path) -> tuple[MetricData, float] | None:
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        (expires_at,) = EXPIRY_HEADER.unpack_from(data)
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            return None
+        return pickle.loads(data[EXPIRY_HEADER.size :]), remaining
+
+    def _write(self, path: Path, value: MetricData, ttl_seconds: float) -> None:
+        payload = EXPIRY_HEADER.pack(time.time() + ttl_seconds) + pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        fd, temp_path = tempfile.mkstemp(dir=self._directory, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as file:
+            file.write(payload)
+        os.replace(temp_path, path)
+
+        self._writes += 1
+        if self._writes % self._prune_every == 0:
+            self._prune()
+
+    def _try_lock(self, path: Path) -> int | None:
+        lock = os.open(path.with_suffix(".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(lock)
+            return None
+        return lock
+
+    def _prune(self) -> None:
+        now = time.time()
+        pruned = 0
+        for path in self._directory.iterdir():
+            if path.suffix or path.name.startswith("."):
+                continue
+            try:
+                with path.open("rb") as file:
+                    (expires_at,) = EXPIRY_HEADER.unpack(file.read(EXPIRY_HEADER.size))
+                if expires_at < now:
+                    path.unlink()
+                    pruned += 1
+            except (FileNotFoundError, struct.error):
+                continue
+        logger.debug(f"Pruned {pruned} expired shared metric entries")
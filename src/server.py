@@ -0,0 +1,27 @@
+import logging
+import os
+from uuid import uuid4
+
+import uvicorn
+
+from src.config import config
+from src.services.leader_election import RUN_ID_ENV
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    logger.info(f"Starting API with {config.api_workers} workers")
+    os.environ[RUN_ID_ENV] = uuid4().hex
+    uvicorn.run(
+        "src.main:app",
+        host=config.api_host,
+        port=config.api_port,
+        workers=config.api_workers,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+
+from src.enums import BufferOverflowPolicy
+from src.services.event_registry import EncodedEvent
+from src.services.kafka_producer import EventProducerInterface, KafkaEventProducer
+
+logger = logging.getLogger(__name__)
+
+
+class EventBufferFullError(Exception):
+    def __init__(self, message: str, accepted: int = 0):
+        super().__init__(message)
+        self.accepted = accepted
+
+
+@dataclass
+class EventBufferStats:
+    capacity: int
+    size: int
+    overflow_policy: BufferOverflowPolicy
+    enqueued_total: int
+    dropped_total: int
+    rejected_total: int
+    sent_total: int
+    failed_total: int
+
+
+class BufferedEventProducer(EventProducerInterface):
+    def __init__(
+        self,
+        producer: KafkaEventProducer,
+        capacity: int,
+        drain_batch_size: int,
+        drain_workers: int,
+        overflow_policy: BufferOverflowPolicy,
+        block_timeout_seconds: float,
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than zero")
+
+        self._producer = producer
+        self._capacity = capacity
+        self._drain_batch_size = drain_batch_size
+        self._drain_workers = drain_workers
+        self._overflow_policy = overflow_policy
+        self._block_timeout_seconds = block_timeout_seconds
+
+        self._buffer: deque[EncodedEvent] = deque()
+        self._condition = asyncio.Condition()
+        self._workers: list[asyncio.Task[None]] = []
+        self._stopping = False
+
+        self._enqueued_total = 0
+        self._dropped_total = 0
+        self._rejected_total = 0
+        self._sent_total = 0
+        self._failed_total = 0
+
+    async def start(self) -> None:
+        await self._producer.start()
+        self._stopping = False
+        self._workers = [asyncio.create_task(self._drain()) for _ in range(self._drain_workers)]
+
+    async def stop(self) -> None:
+        async with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        await asyncio.gather(*self._workers)
+        self._workers = []
+        logger.info(f"Event buffer flushed: {self._sent_total} sent, {self._failed_total} failed")
+        await self._producer.stop()
+
+    async def send_event(self, event: EncodedEvent) -> None:
+        await self._enqueue([event])
+
+    async def send_events(self, events: list[EncodedEvent]) -> None:
+        await self._enqueue(events)
+
+    def stats(self) -> EventBufferStats:
+        return EventBufferStats(
+            capacity=self._capacity,
+            size=len(self._buffer),
+            overflow_policy=self._overflow_policy,
+            enqueued_total=self._enqueued_total,
+            dropped_total=self._dropped_total,
+            rejected_total=self._rejected_total,
+            sent_total=self._sent_total,
+            failed_total=self._failed_total,
+        )
+
+    async def _enqueue(self, events: list[EncodedEvent]) -> None:
+        async with self._condition:
+            accepted = 0
+            try:
+                for event in events:
+                    if self._stopping:
+                        raise EventBufferFullError("Producer is stopping")
+                    if len(self._buffer) >= self._capacity:
+                        await self._handle_overflow()
+                    self._buffer.append(event)
+                    self._enqueued_total += 1
+                    accepted += 1
+            except EventBufferFullError as e:
+                self._rejected_total += len(events) - accepted
+                e.accepted = accepted
+                raise
+            finally:
+                self._condition.notify_all()
+
+    async def _handle_overflow(self) -> None:
+        match self._overflow_policy:
+            case BufferOverflowPolicy.DROP_OLDEST:
+                self._buffer.popleft()
+                self._dropped_total += 1
+            case BufferOverflowPolicy.REJECT:
+                raise EventBufferFullError("Event buffer is full")
+            case BufferOverflowPolicy.BLOCK:
+                self._condition.notify_all()
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait_for(lambda: self._stopping or len(self._buffer) < self._capacity),
+                        timeout=self._block_timeout_seconds,
+                    )
+                except TimeoutError as e:
+                    raise EventBufferFullError("Event buffer is full") from e
+                if self._stopping:
+                    raise EventBufferFullError("Producer is stopping")
+
+    async def _drain(self) -> None:
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self._buffer or self._stopping)
+                if not self._buffer:
+                    return
+                batch = [self._buffer.popleft() for _ in range(min(self._drain_batch_size, len(self._buffer)))]
+                self._condition.notify_all()
+
+            try:
+                await self._producer.send_events(batch)
+                self._sent_total += len(batch)
+            except Exception as e:
+                self._failed_total += len(batch)
+                logger.exception(f"Failed to send {len(batch)} buffered events: {e}")
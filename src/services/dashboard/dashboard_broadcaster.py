@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from src.dto.dashboard.json_encoding import dump_dashboard_json
+from src.enums import MetricType
+from src.services.dashboard.dashboard_service import DashboardServiceInterface
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DashboardUpdate:
+    kind: str
+    tick: int
+    metrics: dict[MetricType, bytes]
+
+
+class DashboardSubscription:
+    def __init__(self, metric_types: frozenset[MetricType] | None, queue_size: int):
+        self._metric_types = metric_types
+        self._queue: asyncio.Queue[DashboardUpdate] = asyncio.Queue(maxsize=queue_size)
+        self._needs_snapshot = True
+
+    async def get(self) -> DashboardUpdate:
+        return await self._queue.get()
+
+    def publish(self, tick: int, changed: dict[MetricType, bytes], snapshot: dict[MetricType, bytes]) -> None:
+        if self._needs_snapshot:
+            self._offer(DashboardUpdate(kind="snapshot", tick=tick, metrics=self._select(snapshot)))
+            return
+
+        metrics = self._select(changed)
+        if not metrics:
+            return
+        if self._queue.full():
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            logger.warning(f"Dashboard subscriber fell {self._queue.maxsize} updates behind, resyncing with snapshot")
+            self._offer(DashboardUpdate(kind="snapshot", tick=tick, metrics=self._select(snapshot)))
+            return
+        self._offer(DashboardUpdate(kind="diff", tick=tick, metrics=metrics))
+
+    def _offer(self, update: DashboardUpdate) -> None:
+        self._queue.put_nowait(update)
+        self._needs_snapshot = False
+
+    def _select(self, metrics: dict[MetricType, bytes]) -> dict[MetricType, bytes]:
+        if self._metric_types is None:
+            return metrics
+        return {metric_type: data for metric_type, data in metrics.items() if metric_type in self._metric_types}
+
+
+class DashboardBroadcaster:
+    def __init__(
+        self, dashboard_service: DashboardServiceInterface, interval_seconds: float, subscriber_queue_size: int
+    ):
+        self._dashboard_service = dashboard_service
+        self._interval_seconds = interval_seconds
+        self._subscriber_queue_size = subscriber_queue_size
+        self._subscribers: set[DashboardSubscription] = set()
+        self._latest: dict[MetricType, bytes] = {}
+        self._tick = 0
+        self._task: asyncio.Task[None] | None = None
+
+    def subscribe(self, metric_types: frozenset[MetricType] | None = None) -> DashboardSubscription:
+        subscription = DashboardSubscription(metric_types, self._subscriber_queue_size)
+        if self._latest:
+            subscription.publish(self._tick, {}, self._latest)
+        self._subscribers.add(subscription)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: DashboardSubscription) -> None:
+        self._subscribers.discard(subscription)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        logger.info(f"Dashboard broadcaster started with {self._interval_seconds}s interval")
+        while self._subscribers:
+            started_at = loop.time()
+            try:
+                await self._publish()
+            except Exception as e:
+                logger.exception(f"Dashboard broadcast failed: {e}")
+            await asyncio.sleep(max(self._interval_seconds - (loop.time() - started_at), 0))
+        self._task = None
+        self._latest = {}
+        logger.info("Dashboard broadcaster stopped, no subscribers left")
+
+    async def _publish(self) -> None:
+        metric_data = await self._dashboard_service.get_all_metrics()
+        snapshot = {metric_type: dump_dashboard_json(data) for metric_type, data in metric_data.items()}
+        changed = {metric_type: data for metric_type, data in snapshot.items() if self._latest.get(metric_type) != data}
+        self._latest = snapshot
+        self._tick += 1
+        for subscription in list(self._subscribers):
+            subscription.publish(self._tick, changed, snapshot)
@@ -1,25 +1,136 @@
+import asyncio
+import logging
 from abc import ABC, abstractmethod
+from dataclasses import replace
+from datetime import UTC, date, datetime, timedelta
 
-from src.dto.dashboard.metric_data import MetricData
-from src.enums import MetricType
+from src.dto.dashboard.metric_data import MetricData, MetricUnavailableData, TimeSeriesData
+from src.dto.dashboard.time_range import MetricTimeRange
+from src.enums import MetricAccuracy, MetricGranularity, MetricType
 from src.repositories.clickhouse_repository import ClickHouseRepositoryInterface
+from src.services.dashboard.live_metric_aggregator import LIVE_METRICS, LiveMetricAggregator
+from src.services.dashboard.time_range import floor_to_bucket, resolve_time_range
+
+logger = logging.getLogger(__name__)
 
 
 class DashboardServiceInterface(ABC):
     @abstractmethod
-    async def get_all_metrics(self) -> dict[MetricType, MetricData]:
+    def resolve_time_range(
+        self, start: datetime | None, end: datetime | None, granularity: MetricGranularity | None
+    ) -> MetricTimeRange | None:
+        ...
+
+    @abstractmethod
+    async def get_all_metrics(
+        self,
+        time_range: MetricTimeRange | None = None,
+        since: date | None = None,
+        accuracy: MetricAccuracy = MetricAccuracy.SKETCH,
+    ) -> dict[MetricType, MetricData]:
+        ...
+
+    @abstractmethod
+    async def get_metrics(
+        self,
+        metric_types: list[MetricType],
+        time_range: MetricTimeRange | None = None,
+        since: date | None = None,
+        accuracy: MetricAccuracy = MetricAccuracy.SKETCH,
+    ) -> dict[MetricType, MetricData]:
         ...
 
 
 class DashboardService(DashboardServiceInterface):
-    def __init__(self, clickhouse_repository: ClickHouseRepositoryInterface):
+    def __init__(
+        self,
+        clickhouse_repository: ClickHouseRepositoryInterface,
+        metric_timeout_seconds: float,
+        max_points: int,
+        default_range_days: int,
+        live_aggregator: LiveMetricAggregator | None = None,
+    ):
         self._clickhouse_repository = clickhouse_repository
+        self._metric_timeout_seconds = metric_timeout_seconds
+        self._max_points = max_points
+        self._default_range = timedelta(days=default_range_days)
+        self._live_aggregator = live_aggregator
+
+    def resolve_time_range(
+        self, start: datetime | None, end: datetime | None, granularity: MetricGranularity | None
+    ) -> MetricTimeRange | None:
+        if start is None and end is None and granularity is None:
+            return None
+        return resolve_time_range(start, end, granularity, self._max_points, self._default_range, now=datetime.now(UTC))
+
+    async def get_all_metrics(
+        self,
+        time_range: MetricTimeRange | None = None,
+        since: date | None = None,
+        accuracy: MetricAccuracy = MetricAccuracy.SKETCH,
+    ) -> dict[MetricType, MetricData]:
+        return await self.get_metrics(list(MetricType), time_range, since, accuracy)
+
+    async def get_metrics(
+        self,
+        metric_types: list[MetricType],
+        time_range: MetricTimeRange | None = None,
+        since: date | None = None,
+        accuracy: MetricAccuracy = MetricAccuracy.SKETCH,
+    ) -> dict[MetricType, MetricData]:
+        metric_types = list(dict.fromkeys(metric_types))
+        results = await asyncio.gather(
+            *(self._get_metric_data(metric_type, time_range, accuracy) for metric_type in metric_types)
+        )
+        if since is not None:
+            results = [data.since(since) if isinstance(data, TimeSeriesData) else data for data in results]
+        return dict(zip(metric_types, results, strict=True))
+
+    async def _get_metric_data(
+        self, metric_type: MetricType, time_range: MetricTimeRange | None, accuracy: MetricAccuracy
+    ) -> MetricData:
+        try:
+            return await asyncio.wait_for(
+                self._load_metric_data(metric_type, time_range, accuracy), timeout=self._metric_timeout_seconds
+            )
+        except TimeoutError:
+            logger.warning(f"Metric {metric_type.value} timed out after {self._metric_timeout_seconds}s")
+            return MetricUnavailableData(error="timeout")
+        except Exception as e:
+            logger.exception(f"Failed to fetch metric {metric_type.value}: {e}")
+            return MetricUnavailableData(error="query_failed")
+
+    async def _load_metric_data(
+        self, metric_type: MetricType, time_range: MetricTimeRange | None, accuracy: MetricAccuracy
+    ) -> MetricData:
+        if (
+            self._live_aggregator is None
+            or metric_type not in LIVE_METRICS
+            or time_range is not None
+            or accuracy != MetricAccuracy.SKETCH
+        ):
+            return await self._clickhouse_repository.get_metric_data(metric_type, time_range, accuracy=accuracy)
+        return await self._get_live_metric_data(metric_type, self._live_aggregator)
 
-    async def get_all_metrics(self) -> dict[MetricType, MetricData]:
-        results: dict[MetricType, MetricData] = {}
+    async def _get_live_metric_data(self, metric_type: MetricType, aggregator: LiveMetricAggregator) -> MetricData:
+        now = datetime.now(UTC)
+        day_start = floor_to_bucket(now, MetricGranularity.DAY)
+        complete_since = aggregator.complete_since
+        if complete_since > now:
+            return await self._clickhouse_repository.get_metric_data(metric_type)
 
-        for metric_type in MetricType:
-            data = await self._clickhouse_repository.get_metric_data(metric_type)
-            results[metric_type] = data
+        if metric_type == MetricType.DAU:
+            users = aggregator.distinct_users(day_start.date())
+            if complete_since <= day_start:
+                return LIVE_METRICS[metric_type](value=users)
+            history = await self._clickhouse_repository.get_metric_data(metric_type)
+            return replace(history, value=max(history.value, users))
 
-        return results
+        cutoff = max(complete_since, day_start)
+        live = aggregator.total(metric_type, cutoff, day_start + timedelta(days=1))
+        if cutoff == day_start:
+            return LIVE_METRICS[metric_type](value=live)
+        history = await self._clickhouse_repository.get_metric_data(
+            metric_type, MetricTimeRange(start=day_start, end=cutoff, granularity=MetricGranularity.HOUR)
+        )
+        return replace(history, value=history.value + type(history.value)(live))
@@ -0,0 +1,40 @@
+import hashlib
+import math
+
+
+class HyperLogLog:
+    __slots__ = ("_precision", "_registers", "_inverse_sum", "_zeros")
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+
+        self._precision = precision
+        self._registers = bytearray(1 << precision)
+        self._inverse_sum = float(len(self._registers))
+        self._zeros = len(self._registers)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self._registers))
+
+    def add(self, value: str) -> None:
+        hashed = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+        width = 64 - self._precision
+        index = hashed >> width
+        rank = width - (hashed & ((1 << width) - 1)).bit_length() + 1
+        current = self._registers[index]
+        if rank <= current:
+            return
+
+        self._registers[index] = rank
+        self._inverse_sum += 2.0**-rank - 2.0**-current
+        if current == 0:
+            self._zeros -= 1
+
+    def estimate(self) -> int:
+        size = len(self._registers)
+        raw = 0.7213 / (1 + 1.079 / size) * size * size / self._inverse_sum
+        if raw <= 2.5 * size and self._zeros:
+            return round(size * math.log(size / self._zeros))
+        return round(raw)
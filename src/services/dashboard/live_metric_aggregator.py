@@ -0,0 +1,116 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
+from src.dto.dashboard.metric_data import (
+    DailyRevenueData,
+    DauData,
+    MetricData,
+    NewRegistrationsTodayData,
+    TotalTransactionsTodayData,
+)
+from src.enums import EventType, MetricGranularity, MetricType
+from src.services.dashboard.hyperloglog import HyperLogLog
+from src.services.dashboard.time_range import ceil_to_bucket, floor_to_bucket
+from src.services.event_registry import RoutableEvent
+
+LIVE_METRICS: dict[MetricType, type[MetricData]] = {
+    MetricType.DAU: DauData,
+    MetricType.NEW_REGISTRATIONS_TODAY: NewRegistrationsTodayData,
+    MetricType.DAILY_REVENUE: DailyRevenueData,
+    MetricType.TOTAL_TRANSACTIONS_TODAY: TotalTransactionsTodayData,
+}
+
+
+@dataclass
+class LiveMetricAggregatorStats:
+    complete_since: datetime
+    recorded: int
+    ignored: int
+    buckets: int
+    days: int
+
+
+class LiveMetricAggregator:
+    def __init__(self, retention_days: int, precision: int, now: datetime | None = None):
+        self._retention = timedelta(days=retention_days)
+        self._precision = precision
+        self._complete_since = ceil_to_bucket(now or datetime.now(UTC), MetricGranularity.HOUR)
+        self._counters: dict[MetricType, defaultdict[datetime, int | Decimal]] = {
+            metric_type: defaultdict(int) for metric_type in LIVE_METRICS if metric_type != MetricType.DAU
+        }
+        self._users: dict[date, HyperLogLog] = {}
+        self._latest_day: date | None = None
+        self._recorded = 0
+        self._ignored = 0
+
+    @property
+    def complete_since(self) -> datetime:
+        return self._complete_since
+
+    def record(self, event: RoutableEvent) -> None:
+        timestamp = event.timestamp
+        timestamp = timestamp.replace(tzinfo=UTC) if timestamp.tzinfo is None else timestamp.astimezone(UTC)
+        if self._latest_day is None or timestamp.date() > self._latest_day:
+            self._latest_day = timestamp.date()
+            self._prune(self._latest_day)
+        if timestamp.date() < self._latest_day - self._retention:
+            self._ignored += 1
+            return
+
+        if event.event_type == EventType.USER_LOGIN:
+            self._day_users(timestamp.date()).add(event.user_id)
+            self._recorded += 1
+            return
+        if event.event_type not in (EventType.USER_REGISTERED, EventType.TRANSACTION):
+            return
+
+        hour = floor_to_bucket(timestamp, MetricGranularity.HOUR)
+        if hour < self._complete_since:
+            self._ignored += 1
+            return
+        if event.event_type == EventType.USER_REGISTERED:
+            self._counters[MetricType.NEW_REGISTRATIONS_TODAY][hour] += 1
+        else:
+            self._counters[MetricType.DAILY_REVENUE][hour] += event.amount
+            self._counters[MetricType.TOTAL_TRANSACTIONS_TODAY][hour] += 1
+        self._recorded += 1
+
+    def record_many(self, events: list[RoutableEvent]) -> None:
+        for event in events:
+            self.record(event)
+
+    def total(self, metric_type: MetricType, start: datetime, end: datetime) -> int | Decimal:
+        return sum(
+            (value for hour, value in self._counters[metric_type].items() if start <= hour < end),
+            start=0,
+        )
+
+    def distinct_users(self, day: date) -> int:
+        users = self._users.get(day)
+        return users.estimate() if users is not None else 0
+
+    def stats(self) -> LiveMetricAggregatorStats:
+        return LiveMetricAggregatorStats(
+            complete_since=self._complete_since,
+            recorded=self._recorded,
+            ignored=self._ignored,
+            buckets=sum(len(counter) for counter in self._counters.values()),
+            days=len(self._users),
+        )
+
+    def _day_users(self, day: date) -> HyperLogLog:
+        users = self._users.get(day)
+        if users is None:
+            users = self._users[day] = HyperLogLog(self._precision)
+        return users
+
+    def _prune(self, day: date) -> None:
+        oldest_day = day - self._retention
+        oldest_hour = datetime.combine(oldest_day, datetime.min.time(), tzinfo=UTC)
+        for stale_day in [stale_day for stale_day in self._users if stale_day < oldest_day]:
+            del self._users[stale_day]
+        for counter in self._counters.values():
+            for stale_hour in [stale_hour for stale_hour in counter if stale_hour < oldest_hour]:
+                del counter[stale_hour]
@@ -0,0 +1,51 @@
+from datetime import UTC, datetime, timedelta
+
+from src.dto.dashboard.time_range import MetricTimeRange
+from src.enums import MetricGranularity
+
+GRANULARITY_STEPS: dict[MetricGranularity, timedelta] = {
+    MetricGranularity.HOUR: timedelta(hours=1),
+    MetricGranularity.DAY: timedelta(days=1),
+    MetricGranularity.WEEK: timedelta(weeks=1),
+}
+
+BUCKET_ORIGIN = datetime(1970, 1, 5, tzinfo=UTC)
+
+
+def floor_to_bucket(moment: datetime, granularity: MetricGranularity) -> datetime:
+    step = GRANULARITY_STEPS[granularity]
+    return BUCKET_ORIGIN + (moment - BUCKET_ORIGIN) // step * step
+
+
+def ceil_to_bucket(moment: datetime, granularity: MetricGranularity) -> datetime:
+    floor = floor_to_bucket(moment, granularity)
+    return floor if floor == moment else floor + GRANULARITY_STEPS[granularity]
+
+
+def _as_utc(moment: datetime) -> datetime:
+    return moment.replace(tzinfo=UTC) if moment.tzinfo is None else moment.astimezone(UTC)
+
+
+def resolve_time_range(
+    start: datetime | None,
+    end: datetime | None,
+    granularity: MetricGranularity | None,
+    max_points: int,
+    default_range: timedelta,
+    now: datetime,
+) -> MetricTimeRange:
+    end = _as_utc(end) if end is not None else now
+    start = _as_utc(start) if start is not None else end - default_range
+    if start >= end:
+        raise ValueError("'from' must be earlier than 'to'")
+
+    minimum_step = GRANULARITY_STEPS[granularity] if granularity is not None else timedelta(0)
+    for candidate, step in GRANULARITY_STEPS.items():
+        if step < minimum_step:
+            continue
+        bucket_start = floor_to_bucket(start, candidate)
+        bucket_end = ceil_to_bucket(end, candidate)
+        if (bucket_end - bucket_start) // step <= max_points:
+            return MetricTimeRange(start=bucket_start, end=bucket_end, granularity=candidate)
+
+    raise ValueError(f"Range from {start.isoformat()} to {end.isoformat()} exceeds {max_points} weekly points")
@@ -0,0 +1,117 @@
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Protocol
+
+from src.enums import EventType, KafkaTopic, MessageKeyField
+from src.services.event_serializers import EventSerializerInterface
+
+
+class RoutableEvent(Protocol):
+    event_type: EventType
+    user_id: str
+
+
+@dataclass(frozen=True)
+class EventRoute:
+    event_type: EventType
+    topic: KafkaTopic
+    fields: tuple[str, ...]
+    schema_version: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedEvent:
+    topic: KafkaTopic
+    value: bytes
+    key: bytes | None = None
+    headers: tuple[tuple[str, bytes], ...] = ()
+
+
+EVENT_ROUTES: tuple[EventRoute, ...] = (
+    EventRoute(EventType.USER_REGISTERED, KafkaTopic.USER_EVENTS, ("user_id", "timestamp")),
+    EventRoute(EventType.USER_LOGIN, KafkaTopic.USER_EVENTS, ("user_id", "timestamp")),
+    EventRoute(
+        EventType.TRANSACTION,
+        KafkaTopic.TRANSACTION_EVENTS,
+        ("user_id", "timestamp", "transaction_id", "amount", "currency"),
+    ),
+    EventRoute(
+        EventType.ELEMENT_CLICK, KafkaTopic.INTERACTION_EVENTS, ("user_id", "timestamp", "element_name", "page")
+    ),
+    EventRoute(EventType.SEARCH, KafkaTopic.INTERACTION_EVENTS, ("user_id", "timestamp", "query")),
+    EventRoute(EventType.PAGE_VIEW, KafkaTopic.INTERACTION_EVENTS, ("user_id", "timestamp", "page")),
+    EventRoute(EventType.FORM_SUBMIT, KafkaTopic.INTERACTION_EVENTS, ("user_id", "timestamp", "form_name")),
+    EventRoute(EventType.ITEM_ADDED_TO_CART, KafkaTopic.INTERACTION_EVENTS, ("user_id", "timestamp", "item_id")),
+    EventRoute(EventType.ITEM_REMOVED_FROM_CART, KafkaTopic.INTERACTION_EVENTS, ("user_id", "timestamp", "item_id")),
+    EventRoute(
+        EventType.FILTER_APPLIED,
+        KafkaTopic.INTERACTION_EVENTS,
+        ("user_id", "timestamp", "filter_name", "filter_value", "page"),
+    ),
+)
+
+
+@dataclass(frozen=True)
+class CompiledEventRoute:
+    event_type: EventType
+    topic: KafkaTopic
+    field_names: tuple[str, ...]
+    key_field: str | None
+    headers: tuple[tuple[str, bytes], ...]
+    getter: attrgetter = field(repr=False)
+
+
+class EventRegistry:
+    def __init__(
+        self,
+        routes: tuple[EventRoute, ...],
+        serializer: EventSerializerInterface,
+        key_field: MessageKeyField,
+    ):
+        self._serializer = serializer
+        self._routes: dict[EventType, CompiledEventRoute] = {}
+        for route in routes:
+            if route.event_type in self._routes:
+                raise ValueError(f"Duplicate route for event type {route.event_type.value}")
+            if not {"user_id", "timestamp"}.issubset(route.fields):
+                raise ValueError(f"Route for {route.event_type.value} must include user_id and timestamp")
+            self._routes[route.event_type] = CompiledEventRoute(
+                event_type=route.event_type,
+                topic=route.topic,
+                field_names=route.fields,
+                key_field=self._resolve_key_field(route, key_field),
+                headers=(
+                    ("event_type", route.event_type.value.encode()),
+                    ("schema_version", str(route.schema_version).encode()),
+                    ("content_type", serializer.content_type.encode()),
+                ),
+                getter=attrgetter(*route.fields),
+            )
+
+    def encode(self, event: RoutableEvent) -> EncodedEvent:
+        route = self._routes.get(event.event_type)
+        if route is None:
+            raise ValueError(f"Unknown event: {type(event)} {event}")
+
+        payload = dict(zip(route.field_names, route.getter(event), strict=True))
+        payload["event_type"] = route.event_type
+        key = None
+        if route.key_field is not None:
+            key_value = payload[route.key_field]
+            key = None if key_value is None else str(key_value).encode()
+        return EncodedEvent(
+            topic=route.topic,
+            value=self._serializer.serialize(route.topic, payload),
+            key=key,
+            headers=route.headers,
+        )
+
+    @staticmethod
+    def _resolve_key_field(route: EventRoute, key_field: MessageKeyField) -> str | None:
+        match key_field:
+            case MessageKeyField.NONE:
+                return None
+            case _ if key_field.value in route.fields:
+                return key_field.value
+            case _:
+                return "user_id"
@@ -0,0 +1,139 @@
+import calendar
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+
+import msgpack
+import orjson
+
+from src.enums import EventSerializationFormat, KafkaTopic
+
+
+@dataclass(frozen=True)
+class SchemaField:
+    name: str
+    decimal_scale: int | None = None
+
+
+TOPIC_SCHEMAS: dict[KafkaTopic, tuple[SchemaField, ...]] = {
+    KafkaTopic.USER_EVENTS: (
+        SchemaField("event_type"),
+        SchemaField("user_id"),
+        SchemaField("timestamp"),
+    ),
+    KafkaTopic.TRANSACTION_EVENTS: (
+        SchemaField("event_type"),
+        SchemaField("user_id"),
+        SchemaField("transaction_id"),
+        SchemaField("amount", decimal_scale=2),
+        SchemaField("currency"),
+        SchemaField("timestamp"),
+    ),
+    KafkaTopic.INTERACTION_EVENTS: (
+        SchemaField("event_type"),
+        SchemaField("user_id"),
+        SchemaField("element_name"),
+        SchemaField("page"),
+        SchemaField("query"),
+        SchemaField("form_name"),
+        SchemaField("item_id"),
+        SchemaField("filter_name"),
+        SchemaField("filter_value"),
+        SchemaField("timestamp"),
+    ),
+}
+
+
+def to_epoch_millis(value: datetime) -> int:
+    return calendar.timegm(value.utctimetuple()) * 1000 + value.microsecond // 1000
+
+
+def _encode_default(value: object) -> object:
+    match value:
+        case datetime():
+            return to_epoch_millis(value)
+        case Decimal():
+            return str(value)
+        case _:
+            raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+class EventSerializerInterface(ABC):
+    content_type: str
+
+    @abstractmethod
+    def serialize(self, topic: KafkaTopic, event: dict[str, object]) -> bytes:
+        pass
+
+    @abstractmethod
+    def deserialize(self, topic: KafkaTopic, payload: bytes) -> dict[str, object]:
+        pass
+
+
+class JsonEventSerializer(EventSerializerInterface):
+    content_type = "application/json"
+
+    def serialize(self, topic: KafkaTopic, event: dict[str, object]) -> bytes:
+        return json.dumps(event, default=_encode_default).encode("utf-8")
+
+    def deserialize(self, topic: KafkaTopic, payload: bytes) -> dict[str, object]:
+        return json.loads(payload)
+
+
+class OrjsonEventSerializer(EventSerializerInterface):
+    content_type = "application/json"
+
+    def serialize(self, topic: KafkaTopic, event: dict[str, object]) -> bytes:
+        return orjson.dumps(event, default=_encode_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+    def deserialize(self, topic: KafkaTopic, payload: bytes) -> dict[str, object]:
+        return orjson.loads(payload)
+
+
+class MsgPackEventSerializer(EventSerializerInterface):
+    content_type = "application/msgpack"
+
+    def __init__(self, schemas: dict[KafkaTopic, tuple[SchemaField, ...]]):
+        self._schemas = schemas
+        self._packer = msgpack.Packer(default=_encode_default)
+
+    def serialize(self, topic: KafkaTopic, event: dict[str, object]) -> bytes:
+        return b"".join(
+            self._packer.pack(self._encode_field(field, event.get(field.name))) for field in self._schemas[topic]
+        )
+
+    def deserialize(self, topic: KafkaTopic, payload: bytes) -> dict[str, object]:
+        schema = self._schemas[topic]
+        unpacker = msgpack.Unpacker()
+        unpacker.feed(payload)
+        row = list(islice(unpacker, len(schema)))
+        if len(row) != len(schema):
+            raise ValueError(f"Expected {len(schema)} msgpack values for {topic.value}, got {len(row)}")
+        if unpacker.tell() != len(payload):
+            raise ValueError(f"Unexpected trailing data after {len(schema)} msgpack values for {topic.value}")
+        return {field.name: self._decode_field(field, value) for field, value in zip(schema, row)}
+
+    def _encode_field(self, field: SchemaField, value: object) -> object:
+        if field.decimal_scale is not None and value is not None:
+            return int(Decimal(str(value)).scaleb(field.decimal_scale).to_integral_value())
+        return value
+
+    def _decode_field(self, field: SchemaField, value: object) -> object:
+        if field.decimal_scale is not None and value is not None:
+            return Decimal(value).scaleb(-field.decimal_scale)
+        return value
+
+
+def create_event_serializer(serialization_format: EventSerializationFormat) -> EventSerializerInterface:
+    match serialization_format:
+        case EventSerializationFormat.JSON:
+            return JsonEventSerializer()
+        case EventSerializationFormat.ORJSON:
+            return OrjsonEventSerializer()
+        case EventSerializationFormat.MSGPACK:
+            return MsgPackEventSerializer(TOPIC_SCHEMAS)
+        case _:
+            raise ValueError(f"Unknown serialization format: {serialization_format}")
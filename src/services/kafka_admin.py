@@ -47,6 +47,7 @@ class KafkaAdminService:
                 return
             except TopicAlreadyExistsError:
                 logger.info("Kafka topics already exist")
+                self._check_partition_counts([topic.name for topic in topics_to_create])
                 return
             except NoBrokersAvailable:
                 if attempt < max_retries - 1:
@@ -60,6 +61,15 @@ class KafkaAdminService:
                 logger.error(f"Failed to create Kafka topics: {e}")
                 raise
 
+    def _check_partition_counts(self, topic_names: list[str]) -> None:
+        for topic in self._get_admin_client().describe_topics(topic_names):
+            partitions = len(topic["partitions"])
+            if partitions != self.kafka_topic_partitions:
+                logger.warning(
+                    f"Kafka topic {topic['topic']} has {partitions} partitions, "
+                    f"expected KAFKA_TOPIC_PARTITIONS={self.kafka_topic_partitions}"
+                )
+
     def close(self) -> None:
         if self.admin_client:
             self.admin_client.close()
@@ -0,0 +1,120 @@
+import asyncio
+from dataclasses import dataclass
+
+from aiokafka import AIOKafkaConsumer, TopicPartition
+from aiokafka.admin import AIOKafkaAdminClient
+
+from src.enums import KafkaTopic
+
+
+class ConsumerLagUnavailableError(Exception):
+    pass
+
+
+@dataclass
+class PartitionLag:
+    partition: int
+    committed_offset: int | None
+    end_offset: int
+    lag: int
+
+
+@dataclass
+class TopicConsumerLag:
+    topic: KafkaTopic
+    consumer_group: str
+    lag: int
+    partitions: list[PartitionLag]
+
+
+@dataclass
+class ConsumerLagReport:
+    total_lag: int
+    max_acceptable_lag: int
+    keeping_up: bool
+    topics: list[TopicConsumerLag]
+
+
+class KafkaConsumerLagService:
+    def __init__(self, bootstrap_servers: str, consumer_groups: dict[KafkaTopic, str], max_acceptable_lag: int):
+        self._bootstrap_servers = bootstrap_servers
+        self._consumer_groups = consumer_groups
+        self._max_acceptable_lag = max_acceptable_lag
+        self._admin_client: AIOKafkaAdminClient | None = None
+        self._consumer: AIOKafkaConsumer | None = None
+        self._start_lock = asyncio.Lock()
+
+    async def get_lag(self) -> ConsumerLagReport:
+        await self._ensure_started()
+        topics = await asyncio.gather(
+            *(self._get_topic_lag(topic, group) for topic, group in self._consumer_groups.items())
+        )
+        total_lag = sum(topic.lag for topic in topics)
+        return ConsumerLagReport(
+            total_lag=total_lag,
+            max_acceptable_lag=self._max_acceptable_lag,
+            keeping_up=total_lag <= self._max_acceptable_lag,
+            topics=list(topics),
+        )
+
+    async def stop(self) -> None:
+        if self._consumer:
+            await self._consumer.stop()
+            self._consumer = None
+        if self._admin_client:
+            await self._admin_client.close()
+            self._admin_client = None
+
+    async def _ensure_started(self) -> None:
+        async with self._start_lock:
+            if self._consumer is None:
+                consumer = AIOKafkaConsumer(bootstrap_servers=self._bootstrap_servers, enable_auto_commit=False)
+                await consumer.start()
+                self._consumer = consumer
+            if self._admin_client is None:
+                admin_client = AIOKafkaAdminClient(bootstrap_servers=self._bootstrap_servers)
+                await admin_client.start()
+                self._admin_client = admin_client
+
+    async def _get_topic_lag(self, topic: KafkaTopic, consumer_group: str) -> TopicConsumerLag:
+        partition_ids = await self._get_partition_ids(topic)
+        partitions = [TopicPartition(topic.value, partition) for partition in partition_ids]
+
+        committed = await self._admin_client.list_consumer_group_offsets(consumer_group, partitions=partitions)
+        beginning_offsets = await self._consumer.beginning_offsets(partitions)
+        end_offsets = await self._consumer.end_offsets(partitions)
+
+        partition_lags: list[PartitionLag] = []
+        for topic_partition in partitions:
+            end_offset = end_offsets[topic_partition]
+            offset_metadata = committed.get(topic_partition)
+            committed_offset = offset_metadata.offset if offset_metadata and offset_metadata.offset >= 0 else None
+            consumed_offset = beginning_offsets[topic_partition] if committed_offset is None else committed_offset
+            partition_lags.append(
+                PartitionLag(
+                    partition=topic_partition.partition,
+                    committed_offset=committed_offset,
+                    end_offset=end_offset,
+                    lag=max(end_offset - consumed_offset, 0),
+                )
+            )
+
+        return TopicConsumerLag(
+            topic=topic,
+            consumer_group=consumer_group,
+            lag=sum(partition.lag for partition in partition_lags),
+            partitions=partition_lags,
+        )
+
+    async def _get_partition_ids(self, topic: KafkaTopic) -> list[int]:
+        for topic_metadata in await self._admin_client.describe_topics([topic.value]):
+            if topic_metadata["topic"] != topic.value:
+                continue
+            if topic_metadata["error_code"] != 0:
+                raise ConsumerLagUnavailableError(
+                    f"Metadata for topic {topic.value} is unavailable, error code {topic_metadata['error_code']}"
+                )
+            partition_ids = sorted(partition["partition"] for partition in topic_metadata["partitions"])
+            if partition_ids:
+                return partition_ids
+        raise ConsumerLagUnavailableError(f"Topic {topic.value} has no partitions")
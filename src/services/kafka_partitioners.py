@@ -0,0 +1,50 @@
+import random
+import zlib
+from abc import ABC, abstractmethod
+from itertools import count
+
+from aiokafka.partitioner import DefaultPartitioner
+
+from src.enums import KafkaPartitionerType
+
+
+class KafkaPartitionerInterface(ABC):
+    @abstractmethod
+    def __call__(self, key: bytes | None, all_partitions: list[int], available: list[int]) -> int:
+        pass
+
+
+class Murmur2Partitioner(KafkaPartitionerInterface):
+    def __init__(self):
+        self._partitioner = DefaultPartitioner()
+
+    def __call__(self, key: bytes | None, all_partitions: list[int], available: list[int]) -> int:
+        return self._partitioner(key, all_partitions, available)
+
+
+class Crc32Partitioner(KafkaPartitionerInterface):
+    def __call__(self, key: bytes | None, all_partitions: list[int], available: list[int]) -> int:
+        if key is None:
+            return random.choice(available or all_partitions)
+        return all_partitions[zlib.crc32(key) % len(all_partitions)]
+
+
+class RoundRobinPartitioner(KafkaPartitionerInterface):
+    def __init__(self):
+        self._counter = count()
+
+    def __call__(self, key: bytes | None, all_partitions: list[int], available: list[int]) -> int:
+        partitions = available or all_partitions
+        return partitions[next(self._counter) % len(partitions)]
+
+
+def create_partitioner(partitioner_type: KafkaPartitionerType) -> KafkaPartitionerInterface:
+    match partitioner_type:
+        case KafkaPartitionerType.MURMUR2:
+            return Murmur2Partitioner()
+        case KafkaPartitionerType.CRC32:
+            return Crc32Partitioner()
+        case KafkaPartitionerType.ROUND_ROBIN:
+            return RoundRobinPartitioner()
+        case _:
+            raise ValueError(f"Unknown partitioner: {partitioner_type}")
@@ -1,26 +1,44 @@
-import json
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from functools import partial
 
 from aiokafka import AIOKafkaProducer
 
+from src.config import KafkaProducerSettings
+from src.services.event_registry import EncodedEvent
+from src.services.kafka_partitioners import KafkaPartitionerInterface
+from src.services.producer_metrics import ProducerMetrics
+
 
 class EventProducerInterface(ABC):
     @abstractmethod
-    async def send_event(self, topic: str, event: dict[str, object]) -> None:
+    async def send_event(self, event: EncodedEvent) -> None:
+        pass
+
+    @abstractmethod
+    async def send_events(self, events: list[EncodedEvent]) -> None:
         pass
 
 
 class KafkaEventProducer(EventProducerInterface):
-    def __init__(self, bootstrap_servers: str):
+    def __init__(self, bootstrap_servers: str, settings: KafkaProducerSettings, partitioner: KafkaPartitionerInterface):
         self.bootstrap_servers = bootstrap_servers
+        self.settings = settings
+        self.partitioner = partitioner
+        self.metrics = ProducerMetrics()
         self.producer: AIOKafkaProducer | None = None
 
-    def _serialize_value(self, value: object) -> bytes:
-        return json.dumps(value).encode("utf-8")
-
     async def start(self) -> None:
         self.producer = AIOKafkaProducer(
-            bootstrap_servers=self.bootstrap_servers, value_serializer=self._serialize_value
+            bootstrap_servers=self.bootstrap_servers,
+            linger_ms=self.settings.linger_ms,
+            max_batch_size=self.settings.max_batch_size,
+            compression_type=self.settings.compression_type,
+            acks=self.settings.acks,
+            enable_idempotence=self.settings.enable_idempotence,
+            request_timeout_ms=self.settings.request_timeout_ms,
+            partitioner=self.partitioner,
         )
         await self.producer.start()
 
@@ -28,8 +46,27 @@ class KafkaEventProducer(EventProducerInterface):
         if self.producer:
             await self.producer.stop()
 
-    async def send_event(self, topic: str, event: dict[str, object]) -> None:
+    async def send_event(self, event: EncodedEvent) -> None:
         if not self.producer:
             raise RuntimeError("Producer not started")
-        topic_name = topic.value if hasattr(topic, "value") else str(topic)
-        await self.producer.send(topic_name, event)
+        self.metrics.events_per_send_call.observe(1)
+        await self._send(event)
+
+    async def send_events(self, events: list[EncodedEvent]) -> None:
+        if not self.producer:
+            raise RuntimeError("Producer not started")
+        self.metrics.events_per_send_call.observe(len(events))
+        for event in events:
+            await self._send(event)
+
+    async def _send(self, event: EncodedEvent) -> None:
+        self.metrics.bytes_serialized_total += len(event.value)
+        delivery = await self.producer.send(event.topic.value, event.value, key=event.key, headers=list(event.headers))
+        delivery.add_done_callback(partial(self._on_delivery, time.perf_counter()))
+
+    def _on_delivery(self, started_at: float, delivery: asyncio.Future) -> None:
+        if delivery.cancelled() or delivery.exception() is not None:
+            self.metrics.records_failed_total += 1
+            return
+        self.metrics.records_sent_total += 1
+        self.metrics.send_latency_ms.observe((time.perf_counter() - started_at) * 1000)
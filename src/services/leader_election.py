@@ -0,0 +1,63 @@
+import asyncio
+import fcntl
+import os
+import tempfile
+from pathlib import Path
+
+RUN_ID_ENV = "API_RUN_ID"
+
+
+class LeaderLock:
+    def __init__(self, path: str, poll_interval_seconds: float = 0.5):
+        self._path = path
+        self._ready_path = Path(f"{path}.ready")
+        self._poll_interval_seconds = poll_interval_seconds
+        self._fd: int | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def mark_ready(self) -> None:
+        fd, temp_path = tempfile.mkstemp(dir=self._ready_path.parent, prefix=".leader-ready-")
+        with os.fdopen(fd, "w") as file:
+            file.write(self._generation())
+        os.replace(temp_path, self._ready_path)
+
+    def is_ready(self) -> bool:
+        try:
+            return self._ready_path.read_text() == self._generation()
+        except FileNotFoundError:
+            return False
+
+    async def wait_for_leader(self) -> None:
+        while not self.is_ready():
+            if self.try_acquire():
+                return
+            await asyncio.sleep(self._poll_interval_seconds)
+
+    def _generation(self) -> str:
+        return os.getenv(RUN_ID_ENV) or str(os.getppid())
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
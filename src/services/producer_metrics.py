@@ -0,0 +1,53 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+
+
+@dataclass
+class HistogramSnapshot:
+    buckets: dict[str, int]
+    count: int
+    sum: float
+
+
+class Histogram:
+    def __init__(self, bounds: tuple[float, ...]):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._sum += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        labels = [f"{bound:g}" for bound in self._bounds] + ["+Inf"]
+        return HistogramSnapshot(buckets=dict(zip(labels, self._counts, strict=True)), count=self._count, sum=self._sum)
+
+
+@dataclass
+class ProducerMetricsSnapshot:
+    records_sent_total: int
+    records_failed_total: int
+    bytes_serialized_total: int
+    events_per_send_call: HistogramSnapshot
+    send_latency_ms: HistogramSnapshot
+
+
+class ProducerMetrics:
+    def __init__(self):
+        self.records_sent_total = 0
+        self.records_failed_total = 0
+        self.bytes_serialized_total = 0
+        self.events_per_send_call = Histogram((1, 10, 50, 100, 250, 500, 1000, 5000))
+        self.send_latency_ms = Histogram((1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000))
+
+    def snapshot(self) -> ProducerMetricsSnapshot:
+        return ProducerMetricsSnapshot(
+            records_sent_total=self.records_sent_total,
+            records_failed_total=self.records_failed_total,
+            bytes_serialized_total=self.bytes_serialized_total,
+            events_per_send_call=self.events_per_send_call.snapshot(),
+            send_latency_ms=self.send_latency_ms.snapshot(),
+        )